@@ -0,0 +1,107 @@
+"""Run the benchmark suite (from ``src``):
+
+    python -m benchmarks run --output baseline.json
+    python -m benchmarks run --output current.json --compare baseline.json
+    python -m benchmarks compare baseline.json current.json
+    python -m benchmarks record --games 20
+
+``compare`` (and ``run --compare``) exit with status 1 if any benchmark's
+median got slower than the threshold allows.
+"""
+
+import argparse
+import json
+import sys
+from .suite import GROUPS, AI_DIFFICULTIES, CORPUS_PATH, LEADERBOARD_ROWS, run, compare, record_corpus
+
+
+def print_results(report, out=sys.stdout):
+    machine = report["machine"]
+    print(f"{machine['platform']}, Python {machine['python']}, {machine['cpu_count']} CPUs", file=out)
+    print(f"{'benchmark':<34} {'median':>12} {'p95':>12} {'samples':>8}", file=out)
+    for name, result in report["results"].items():
+        print(f"{name:<34} {_format_us(result['median']):>12} {_format_us(result['p95']):>12} "
+              f"{result['samples']:>8}", file=out)
+
+
+def print_comparison(rows, threshold, out=sys.stdout):
+    print(f"{'benchmark':<34} {'baseline':>12} {'current':>12} {'change':>8}", file=out)
+    for name, before, after, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<34} {_format_us(before):>12} {_format_us(after):>12} {ratio - 1:>+8.1%}{flag}", file=out)
+
+    regressions = sum(1 for row in rows if row[4])
+    if regressions:
+        print(f"{regressions} benchmark(s) more than {threshold:.0%} slower than the baseline", file=out)
+    else:
+        print(f"No regressions beyond {threshold:.0%}", file=out)
+    return regressions
+
+
+def _format_us(value):
+    if value >= 1e6:
+        return f"{value / 1e6:.2f} s"
+    if value >= 1e3:
+        return f"{value / 1e3:.2f} ms"
+    return f"{value:.2f} us"
+
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Super Tic Tac Toe benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--output", help="JSON file for the results")
+    run_parser.add_argument("--groups", nargs="+", choices=GROUPS, default=list(GROUPS))
+    run_parser.add_argument("--difficulties", nargs="+", choices=AI_DIFFICULTIES, default=list(AI_DIFFICULTIES))
+    run_parser.add_argument("--number", type=int, default=200, help="calls per sample for the fast benchmarks")
+    run_parser.add_argument("--per-game", type=int, default=3, help="AI positions taken from each recorded game")
+    run_parser.add_argument("--leaderboard-rows", type=int, nargs="+", default=list(LEADERBOARD_ROWS),
+                            help="leaderboard sizes to bulk-load and query")
+    run_parser.add_argument("--corpus", default=CORPUS_PATH)
+    run_parser.add_argument("--compare", metavar="BASELINE", help="compare against a saved results file")
+    run_parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown before flagging")
+
+    compare_parser = commands.add_parser("compare", help="compare two results files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown before flagging")
+
+    record_parser = commands.add_parser("record", help="re-record the corpus of games")
+    record_parser.add_argument("--games", type=int, default=20)
+    record_parser.add_argument("--seed", type=int, default=0)
+    record_parser.add_argument("--output", default=CORPUS_PATH)
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        games = record_corpus(args.games, args.seed, args.output)
+        print(f"Recorded {len(games)} games ({sum(map(len, games))} moves) to {args.output}")
+        return
+
+    if args.command == "compare":
+        rows = compare(_load(args.baseline), _load(args.current), args.threshold)
+        sys.exit(1 if print_comparison(rows, args.threshold) else 0)
+
+    report = run(
+        groups=args.groups, difficulties=args.difficulties, number=args.number, per_game=args.per_game,
+        corpus=args.corpus, leaderboard_rows=args.leaderboard_rows, progress=lambda group: print(f"Running {group} benchmarks...", file=sys.stderr)
+    )
+    print_results(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        rows = compare(_load(args.compare), report, args.threshold)
+        print()
+        sys.exit(1 if print_comparison(rows, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
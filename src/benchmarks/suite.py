@@ -0,0 +1,349 @@
+"""Benchmarks for the engine, the Qt board and every AI difficulty.
+
+Timings are taken over a corpus of recorded games (positions.json), so runs on
+different commits measure the same positions. Each benchmark produces a list
+of samples in microseconds per call; ``summarize`` turns them into the
+figures that are written out and compared.
+"""
+
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from game.core.engine import GameState, from_move
+from game.ai import rules
+
+CORPUS_PATH = Path(__file__).resolve().parent / "positions.json"
+STYLESHEET_PATH = Path(__file__).resolve().parent.parent / "styling" / "styles.qss"
+AI_DIFFICULTIES = ("Easy", "Medium", "Hard", "Expert", "MCTS")
+LEADERBOARD_ROWS = (100, 10_000, 1_000_000)
+
+_app = None
+
+
+# Corpus
+
+def record_corpus(games=20, seed=0, path=CORPUS_PATH):
+    """Play seeded Hard-vs-Hard games with some random moves mixed in, and save their moves"""
+    rng = random.Random(seed)
+    recorded = []
+    for _ in range(games):
+        state = GameState()
+        moves = []
+        while state.winner() is None:
+            if rng.random() < 0.3:
+                move = rules.random_move(state, rng)
+            else:
+                move = rules.hard_move(state, rng)
+            state.make_move(move)
+            moves.append(move)
+        recorded.append(moves)
+
+    with open(path, "w") as f:
+        json.dump({"seed": seed, "games": recorded}, f)
+    return recorded
+
+
+def load_corpus(path=CORPUS_PATH):
+    with open(path) as f:
+        return json.load(f)["games"]
+
+
+def replay(moves):
+    state = GameState()
+    for move in moves:
+        state.make_move(move)
+    return state
+
+
+def corpus_positions(games):
+    """Every position before a game's last move, as move prefixes"""
+    return [moves[:ply] for moves in games for ply in range(len(moves))]
+
+
+def ai_positions(games, per_game=3):
+    """Mid-game positions with O (the AI) to move, spread over each game"""
+    positions = []
+    for moves in games:
+        last = len(moves) - 1
+        for step in range(1, per_game + 1):
+            ply = last * step // (per_game + 1)
+            ply += 1 - ply % 2  # O moves on odd plies
+            if ply < last:
+                positions.append(moves[:ply])
+    return positions
+
+
+# Timing
+
+def time_calls(fn, args_list, number=1):
+    """Microseconds per call of ``fn(*args)``, one sample per args entry"""
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(*args)
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "unit": "us",
+        "samples": len(ordered),
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "min": ordered[0],
+    }
+
+
+def machine_info():
+    info = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+    }
+    try:
+        from PyQt6.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
+        info["pyqt"] = PYQT_VERSION_STR
+        info["qt"] = QT_VERSION_STR
+    except ImportError:
+        pass
+    try:
+        info["commit"] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    return info
+
+
+# Engine benchmarks (no Qt)
+
+def bench_engine(games, number):
+    from game.ai.evaluation import evaluate
+
+    states = [replay(moves) for moves in corpus_positions(games)]
+    args = [(state,) for state in states]
+
+    def make_unmake(state):
+        for move in state.legal_moves():
+            state.make_move(move)
+            state.unmake_move()
+
+    return {
+        "engine.legal_moves": time_calls(GameState.legal_moves, args, number),
+        "engine.make_unmake_all": time_calls(make_unmake, args, max(1, number // 10)),
+        "engine.evaluate": time_calls(evaluate, args, number),
+    }
+
+
+def bench_batch_eval(games, number):
+    try:
+        from game.ai import batch_eval
+    except ImportError:
+        return {}  # NumPy not installed
+
+    positions, active = batch_eval.encode([replay(moves) for moves in corpus_positions(games)])
+    samples = time_calls(batch_eval.evaluate_batch, [(positions, active)] * max(5, number // 20))
+    # Report per position so the figure is comparable with the engine benchmarks
+    return {"batch_eval.per_position": [sample / len(positions) for sample in samples]}
+
+
+# Board benchmarks (offscreen Qt)
+
+def _application():
+    global _app
+    from PyQt6.QtWidgets import QApplication
+    _app = QApplication.instance() or QApplication(sys.argv[:1])
+    if STYLESHEET_PATH.exists():
+        _app.setStyleSheet(STYLESHEET_PATH.read_text())
+    return _app
+
+
+def _make_board(moves=(), difficulty=None):
+    from game.core.board import Board
+    from game.ai.endgame import EndgameSolver
+    from game.data.endgame_cache import EndgameCache
+
+    board = Board(difficulty=None)
+    board.display_winner = lambda winner: None  # No modal result dialog
+    # A private, in-memory endgame cache so earlier runs can't answer for this one
+    solver = EndgameSolver(cache=EndgameCache(":memory:"))
+    board.endgame_solver = board.search_engine.endgame = board.mcts_engine.endgame = solver
+    board.hard_engine.endgame = solver
+
+    for move in moves:
+        _play(board, move)
+    board.difficulty = difficulty
+    return board
+
+
+def _play(board, move):
+    mini_game_row, mini_game_col, square_row, square_col = from_move(move)
+    square = board.mini_games[mini_game_row][mini_game_col].squares[square_row][square_col]
+    board.make_move(square, mini_game_row, mini_game_col)
+
+
+def _dispose(board):
+    board.shutdown()
+    board.deleteLater()
+    _app.processEvents()
+
+
+def bench_board(games, number):
+    app = _application()
+    results = {"board.get_available_moves": [], "board.check_mini_game_win": [],
+               "board.check_overall_winner": [], "board.make_move": []}
+
+    for moves in games:
+        board = _make_board()
+        # The game's last move ends it; everything before that is a mid-game make_move
+        for move in moves[:-1]:
+            args = [()]
+            results["board.get_available_moves"] += time_calls(board.get_available_moves, args, number)
+            results["board.check_mini_game_win"] += time_calls(
+                lambda: [board.check_mini_game_win(mini_game, player)
+                         for row in board.mini_games for mini_game in row for player in "XO"],
+                args, max(1, number // 10)
+            )
+            results["board.check_overall_winner"] += time_calls(board.check_overall_winner, args, number)
+
+            start = time.perf_counter()
+            _play(board, move)
+            results["board.make_move"].append((time.perf_counter() - start) * 1e6)
+            app.processEvents()  # Let queued repaints happen outside the timed call
+        _dispose(board)
+
+    return results
+
+
+def bench_ai(games, difficulties=AI_DIFFICULTIES, per_game=3, timeout=30.0):
+    """Time from ai_make_move() until the AI's move is on the board"""
+    from PyQt6.QtCore import QEventLoop, QTimer
+
+    app = _application()
+    positions = ai_positions(games, per_game)
+    results = {}
+
+    for difficulty in difficulties:
+        samples = []
+        for moves in positions:
+            board = _make_board(moves, difficulty)
+            loop = QEventLoop()
+            board.turn_changed.connect(loop.quit)
+
+            start = time.perf_counter()
+            board.ai_make_move()
+            if board.current_player == board.ai_player:
+                # Expert, MCTS and Hard's endgames search on the AI thread and play when done
+                QTimer.singleShot(int(timeout * 1000), loop.quit)
+                loop.exec()
+            samples.append((time.perf_counter() - start) * 1e6)
+
+            _dispose(board)
+        results[f"ai.{difficulty}"] = samples
+        app.processEvents()
+
+    return results
+
+
+# Leaderboard benchmarks (scratch SQLite databases)
+
+def bench_leaderboard(sizes=LEADERBOARD_ROWS, number=200):
+    """Bulk-load leaderboards of each size and time reading the top rows in each way"""
+    from game.data import database
+
+    saved_path, saved_top = database.DB_PATH, database.TOP_SCORES_SIZE
+    database.TOP_SCORES_SIZE = database.LEADERBOARD_SIZE  # Build top_scores so it can be timed too
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for size in sizes:
+                database.close_connections()
+                database.DB_PATH = Path(directory) / f"leaderboard_{size}.db"
+                database.initialize_database()
+                conn = database.get_connection()
+
+                rng = random.Random(size)
+                rows = [(f"player{rng.randrange(10_000)}", rng.randrange(2_000)) for _ in range(size)]
+                start = time.perf_counter()
+                with conn:  # One transaction, with the index and top_scores triggers maintained
+                    conn.executemany("INSERT INTO leaderboard (player_name, score) VALUES (?, ?)", rows)
+                results[f"leaderboard.bulk_load.{size}"] = [(time.perf_counter() - start) / size * 1e6]
+
+                def query(sql):
+                    return lambda: conn.execute(sql, (database.LEADERBOARD_SIZE,)).fetchall()
+
+                args = [()] * 10
+                results[f"leaderboard.index.{size}"] = time_calls(query(
+                    "SELECT player_name, score FROM leaderboard ORDER BY score DESC, player_name, id LIMIT ?"
+                ), args, number)
+                results[f"leaderboard.top_scores.{size}"] = time_calls(query(
+                    "SELECT player_name, score FROM top_scores ORDER BY score DESC, player_name, id LIMIT ?"
+                ), args, number)
+                # What every read cost before the index: a scan and sort of the whole table
+                results[f"leaderboard.full_scan.{size}"] = time_calls(query(
+                    "SELECT player_name, score FROM leaderboard NOT INDEXED ORDER BY score DESC LIMIT ?"
+                ), args, max(1, number * 100 // size))
+            database.close_connections()
+    finally:
+        database.DB_PATH, database.TOP_SCORES_SIZE = saved_path, saved_top
+    return results
+
+
+# Running and comparing
+
+GROUPS = ("engine", "batch_eval", "board", "ai", "leaderboard")
+
+
+def run(groups=GROUPS, difficulties=AI_DIFFICULTIES, number=200, per_game=3, corpus=CORPUS_PATH, progress=None,
+        leaderboard_rows=LEADERBOARD_ROWS):
+    games = load_corpus(corpus)
+    raw = {}
+    for group in groups:
+        if progress:
+            progress(group)
+        if group == "engine":
+            raw.update(bench_engine(games, number))
+        elif group == "batch_eval":
+            raw.update(bench_batch_eval(games, number))
+        elif group == "board":
+            raw.update(bench_board(games, max(1, number // 10)))
+        elif group == "ai":
+            raw.update(bench_ai(games, difficulties, per_game))
+        elif group == "leaderboard":
+            raw.update(bench_leaderboard(leaderboard_rows, number))
+
+    return {
+        "machine": machine_info(),
+        "corpus": {"games": len(games), "positions": len(corpus_positions(games))},
+        "results": {name: summarize(samples) for name, samples in raw.items() if samples},
+    }
+
+
+def compare(baseline, current, threshold=0.15, stat="median"):
+    """Return [(name, baseline, current, ratio, regressed)] for benchmarks in both runs"""
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None or not before[stat]:
+            continue
+        ratio = result[stat] / before[stat]
+        rows.append((name, before[stat], result[stat], ratio, ratio > 1 + threshold))
+    return rows
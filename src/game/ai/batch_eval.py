@@ -0,0 +1,182 @@
+"""Vectorized evaluation of many positions at once with NumPy.
+
+Positions are rows of an (N, 81) int8 array indexed by move (``board * 9 +
+cell``): 0 for an empty cell, 1 for X and 2 for O. The active board of each
+position is given separately (``ANY_BOARD`` when the player may choose).
+Each 9-cell mini-board is packed into a 9-bit mask with one matrix product,
+after which every rule is a lookup into the same tables the engine uses, so
+a whole batch costs a handful of array operations instead of a Python loop
+per position.
+
+``canonicalize`` maps a batch onto one representative per symmetry class, the
+same one ``game.core.symmetry`` picks, so datasets built from self-play hold
+each position once.
+"""
+
+import numpy as np
+from game.core.engine import ANY_BOARD, FULL, X, O, ZOBRIST_CELLS, ZOBRIST_ACTIVE, ZOBRIST_SIDE
+from game.core.tables import WIN, TRANSFORMS, INVERSE
+from game.core.symmetry import MOVE_TRANSFORMS
+from .evaluation import MACRO_WEIGHTS, TERNARY, MINI_VALUES, MACRO_VALUES
+
+EMPTY_CELL, X_CELL, O_CELL = 0, 1, 2
+NO_WINNER, X_WINS, O_WINS, DRAW = 0, 1, 2, 3
+
+_BITS = (1 << np.arange(9)).astype(np.int16)
+_WIN = np.array(WIN, dtype=bool)
+_TERNARY = np.array(TERNARY, dtype=np.int32)
+_MINI_VALUES = np.array(MINI_VALUES, dtype=np.int32)
+_MACRO_VALUES = np.array(MACRO_VALUES, dtype=np.int32)
+_WEIGHTS = np.array(MACRO_WEIGHTS, dtype=np.int32)
+
+# _UNDO[t, move] -> the move on the original board that lands on ``move`` in image t,
+# so image t of a batch is positions[:, _UNDO[t]]
+_UNDO = np.array([MOVE_TRANSFORMS[INVERSE[t]] for t in range(8)], dtype=np.intp)
+# _ACTIVE_IMAGE[t, active + 1] -> active board of image t
+_ACTIVE_IMAGE = np.array(
+    [[ANY_BOARD] + list(TRANSFORMS[t]) for t in range(8)], dtype=np.int8
+)
+_ZOBRIST_CELLS = np.array(ZOBRIST_CELLS, dtype=np.uint64)
+_ZOBRIST_ACTIVE = np.array(ZOBRIST_ACTIVE, dtype=np.uint64)
+
+
+def encode(states):
+    """Pack GameStates into (positions, active) arrays"""
+    positions = np.zeros((len(states), 81), dtype=np.int8)
+    active = np.empty(len(states), dtype=np.int8)
+    for row, state in enumerate(states):
+        for side, value in ((X, X_CELL), (O, O_CELL)):
+            for board, mask in enumerate(state.cells[side]):
+                for cell in range(9):
+                    if mask >> cell & 1:
+                        positions[row, board * 9 + cell] = value
+        active[row] = state.active
+    return positions, active
+
+
+def _masks(positions):
+    """(N, 9) occupancy masks of X and O for every mini-board"""
+    boards = positions.reshape(-1, 9, 9)
+    x = (boards == X_CELL).astype(np.int16) @ _BITS
+    o = (boards == O_CELL).astype(np.int16) @ _BITS
+    return x, o
+
+
+def _macro_masks(board_winners):
+    return (
+        (board_winners == X_WINS).astype(np.int16) @ _BITS,
+        (board_winners == O_WINS).astype(np.int16) @ _BITS,
+    )
+
+
+def _mini_winners(x, o):
+    winners = np.where(_WIN[x], X_WINS, np.where(_WIN[o], O_WINS, NO_WINNER)).astype(np.int8)
+    winners[(winners == NO_WINNER) & ((x | o) == FULL)] = DRAW
+    return winners
+
+
+def _macro_winner(board_winners, x_macro, o_macro):
+    winner = np.where(_WIN[x_macro], X_WINS, np.where(_WIN[o_macro], O_WINS, NO_WINNER)).astype(np.int8)
+    winner[(winner == NO_WINNER) & (board_winners != NO_WINNER).all(axis=1)] = DRAW
+    return winner
+
+
+def mini_winners(positions):
+    """(N, 9) result of every mini-board: NO_WINNER, X_WINS, O_WINS or DRAW (full)"""
+    return _mini_winners(*_masks(positions))
+
+
+def macro_winner(positions):
+    """(N,) result of every game: NO_WINNER, X_WINS, O_WINS or DRAW"""
+    board_winners = mini_winners(positions)
+    return _macro_winner(board_winners, *_macro_masks(board_winners))
+
+
+def legal_moves(positions, active):
+    """(N, 81) bool mask of the legal moves in every position"""
+    board_winners = mini_winners(positions)
+    return _legal(positions, active, board_winners, _macro_winner(board_winners, *_macro_masks(board_winners)))
+
+
+def _legal(positions, active, board_winners, winner):
+    active = np.asarray(active)
+    open_boards = board_winners == NO_WINNER
+    allowed = open_boards & ((active[:, None] == ANY_BOARD) | (active[:, None] == np.arange(9)))
+    allowed &= (winner == NO_WINNER)[:, None]
+    return (positions.reshape(-1, 9, 9) == EMPTY_CELL) & allowed[:, :, None]
+
+
+def evaluate(positions, sides=None):
+    """(N,) heuristic scores matching ``evaluation.evaluate``.
+
+    Scores are from X's point of view, or from the side to move's when
+    ``sides`` (an array of X/O) is given.
+    """
+    x, o = _masks(positions)
+    board_winners = _mini_winners(x, o)
+    x_macro, o_macro = _macro_masks(board_winners)
+    return _score(x, o, board_winners, x_macro, o_macro, sides)
+
+
+def _score(x, o, board_winners, x_macro, o_macro, sides):
+    # The same tables as evaluation.evaluate, looked up for every board at once
+    score = _MINI_VALUES[_TERNARY[x] + 2 * _TERNARY[o]] @ _WEIGHTS
+    drawn = (board_winners == DRAW).astype(np.int16) @ _BITS
+    score += _MACRO_VALUES[_TERNARY[x_macro] + 2 * _TERNARY[o_macro | drawn]]
+    score -= _MACRO_VALUES[_TERNARY[o_macro] + 2 * _TERNARY[x_macro | drawn]]
+
+    if sides is not None:
+        score = np.where(np.asarray(sides) == O, -score, score)
+    return score
+
+
+def evaluate_batch(positions, active, sides=None):
+    """Everything at once, sharing the work between the parts.
+
+    Returns a dict of ``legal`` (N, 81), ``mini_winners`` (N, 9),
+    ``winner`` (N,) and ``score`` (N,) arrays.
+    """
+    positions = np.asarray(positions, dtype=np.int8).reshape(-1, 81)
+    x, o = _masks(positions)
+    board_winners = _mini_winners(x, o)
+    x_macro, o_macro = _macro_masks(board_winners)
+    winner = _macro_winner(board_winners, x_macro, o_macro)
+    return {
+        "legal": _legal(positions, active, board_winners, winner),
+        "mini_winners": board_winners,
+        "winner": winner,
+        "score": _score(x, o, board_winners, x_macro, o_macro, sides),
+    }
+
+
+def canonicalize(positions, active, sides=None):
+    """Map every position to the canonical member of its symmetry class.
+
+    ``sides`` defaults to the side implied by the mark counts. Returns the
+    canonical positions (N, 81), their active boards (N,), the transform used
+    for each (N,) and their canonical Zobrist hashes (N,) as uint64, equal to
+    ``game.core.symmetry.canonical_key``.
+    """
+    positions = np.asarray(positions, dtype=np.int8).reshape(-1, 81)
+    active = np.asarray(active, dtype=np.intp)
+    if sides is None:
+        sides = ((positions == X_CELL).sum(axis=1) > (positions == O_CELL).sum(axis=1)).astype(np.int8)
+
+    images = positions[:, _UNDO]  # (N, 8, 81)
+    keys = np.bitwise_xor.reduce(
+        np.where(images == X_CELL, _ZOBRIST_CELLS[X], np.uint64(0))
+        ^ np.where(images == O_CELL, _ZOBRIST_CELLS[O], np.uint64(0)),
+        axis=2,
+    )
+    image_active = _ACTIVE_IMAGE[:, active + 1].T  # (N, 8)
+    keys ^= _ZOBRIST_ACTIVE[image_active.astype(np.intp) + 1]
+    keys ^= np.where(np.asarray(sides) == O, np.uint64(ZOBRIST_SIDE), np.uint64(0))[:, None]
+
+    transforms = keys.argmin(axis=1)
+    rows = np.arange(len(positions))
+    return images[rows, transforms], image_active[rows, transforms], transforms, keys[rows, transforms]
+
+
+def restore_moves(moves, transforms):
+    """Map moves chosen on canonical positions back onto the original positions"""
+    return _UNDO[np.asarray(transforms), np.asarray(moves)]
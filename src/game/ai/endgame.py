@@ -0,0 +1,143 @@
+"""Exact endgame solver.
+
+Once few empty cells are left in the open mini-boards, the game tree is
+small enough to search to the end. The solver works in win/draw/loss terms,
+stops looking at a position as soon as it finds a winning move, and keeps
+every exact result in memory. Results for the positions the AI actually
+asks about are also written to an on-disk cache, keyed by symmetry class, so
+a repeat of the same endgame (or a rotation or reflection of it) is answered
+without searching at all.
+"""
+
+import time
+from game.core.engine import FULL
+from game.core.tables import CELLS
+from game.core.symmetry import transform_move, restore_move
+from game.data.endgame_cache import EndgameCache, position_key
+
+WIN, DRAW, LOSS = 1, 0, -1  # From the side to move's point of view
+
+_default_solver = None
+
+
+class SolverTimeout(Exception):
+    pass
+
+
+def remaining_moves(state):
+    """Number of empty cells left in mini-boards that can still be played"""
+    count = 0
+    for board in CELLS[FULL & ~state.closed]:
+        count += len(CELLS[state.empty[board]])
+    return count
+
+
+class EndgameSolver:
+    def __init__(self, threshold=12, time_limit=0.5, cache=None, max_memo=2_000_000):
+        self.threshold = threshold  # Solve once this many moves or fewer remain
+        self.time_limit = time_limit  # Give up (and let the normal AI move) after this long
+        self.cache = cache  # Optional persistent EndgameCache
+        self.max_memo = max_memo
+        self.memo = {}  # Zobrist hash -> exact value, kept across moves and games
+        self.nodes = 0
+        self.deadline = 0.0
+        self.cancel = None
+        self.cache_hits = 0
+        self.source = None  # How the last move was found: "endgame" or "endgame cache"
+
+    def applies(self, state):
+        return state.winner() is None and remaining_moves(state) <= self.threshold
+
+    def best_move(self, state, time_limit=None, cancel=None):
+        """Return a perfect move index, or None if the position isn't an endgame or time ran out.
+
+        ``time_limit`` caps this call below the solver's own limit, so a search can
+        count the solve against its budget; setting the ``cancel`` event stops it early.
+        """
+        # Reset first, so a cache hit doesn't report the figures of an earlier solve
+        self.nodes = 0
+        self.source = None
+        if not self.applies(state):
+            return None
+
+        key, transform = position_key(state)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache_hits += 1
+                self.source = "endgame cache"
+                return restore_move(cached[1], transform)
+
+        state = state.copy()
+        if len(self.memo) > self.max_memo:
+            self.memo.clear()
+        if time_limit is None or time_limit > self.time_limit:
+            time_limit = self.time_limit
+        self.deadline = time.perf_counter() + time_limit
+        self.cancel = cancel
+        try:
+            value, move = self._solve_root(state)
+        except SolverTimeout:
+            return None
+
+        if self.cache is not None:
+            self.cache.put(key, value, transform_move(move, transform))
+        self.source = "endgame"
+        return move
+
+    def stats(self):
+        return {
+            "threshold": self.threshold,
+            "nodes": self.nodes,
+            "memo_size": len(self.memo),
+            "cache_hits": self.cache_hits,
+        }
+
+    def _solve_root(self, state):
+        best_value, best_move = LOSS - 1, None
+        for move in state.legal_moves():
+            state.make_move(move)
+            value = -self._solve(state)
+            state.unmake_move()
+            if value > best_value:
+                best_value, best_move = value, move
+                if value == WIN:
+                    break
+        return best_value, best_move
+
+    def _solve(self, state):
+        result = state.result
+        if result is not None:
+            # The previous mover either won or drew
+            return DRAW if result == "Draw" else LOSS
+
+        value = self.memo.get(state.hash)
+        if value is not None:
+            return value
+
+        self.nodes += 1
+        if not self.nodes & 1023 and (
+            time.perf_counter() >= self.deadline or self.cancel is not None and self.cancel.is_set()
+        ):
+            raise SolverTimeout
+
+        best = LOSS
+        for move in state.legal_moves():
+            state.make_move(move)
+            value = -self._solve(state)
+            state.unmake_move()
+            if value > best:
+                best = value
+                if best == WIN:
+                    break
+
+        self.memo[state.hash] = best
+        return best
+
+
+def get_default_solver():
+    """One solver per process, backed by the on-disk cache at CACHE_PATH"""
+    global _default_solver
+    if _default_solver is None:
+        _default_solver = EndgameSolver(cache=EndgameCache())
+    return _default_solver
@@ -0,0 +1,78 @@
+"""Table-driven static evaluation shared by the search-based AIs.
+
+A 3x3 board is indexed in base 3, one digit per cell (0 empty, 1 for the
+player being scored, 2 for the other side), giving 3^9 = 19,683
+configurations. Every configuration's value is computed once at import, so
+scoring a position is a lookup per mini-board plus two for the macro board
+and a weighted sum.
+"""
+
+from game.core.engine import FULL
+from game.core.tables import WIN, COMPLETING, CELLS
+
+# Owning the centre mini-board is worth more than a corner, a corner more than an edge
+MACRO_WEIGHTS = (3, 2, 3, 2, 4, 2, 3, 2, 3)
+
+MINI_THREAT = 10  # Per two-in-a-row with the third cell free, times the board's weight
+MACRO_BOARD = 100  # Per won mini-board, times its weight
+MACRO_THREAT = 250  # Per two won mini-boards lined up with the third still open
+
+# TERNARY[mask] -> base-3 index of the cells in the mask with digit 1
+TERNARY = tuple(sum(3 ** cell for cell in CELLS[mask]) for mask in range(512))
+
+
+def index(mine, theirs):
+    """Base-3 table index of a board from two 9-bit masks"""
+    return TERNARY[mine] + 2 * TERNARY[theirs]
+
+
+def _masks(index):
+    mine = theirs = 0
+    for cell in range(9):
+        index, digit = divmod(index, 3)
+        if digit == 1:
+            mine |= 1 << cell
+        elif digit == 2:
+            theirs |= 1 << cell
+    return mine, theirs
+
+
+def _threats(mine, free):
+    return bin(COMPLETING[mine] & free).count("1")
+
+
+def _mini_value(mine, theirs):
+    if WIN[mine] or WIN[theirs] or mine | theirs == FULL:
+        return 0  # Decided boards are scored on the macro board
+    empty = FULL & ~(mine | theirs)
+    return MINI_THREAT * (_threats(mine, empty) - _threats(theirs, empty))
+
+
+def _macro_value(won, blocked):
+    # ``blocked`` holds the boards nobody can win any more for this player:
+    # the opponent's and the drawn ones
+    value = MACRO_BOARD * sum(MACRO_WEIGHTS[board] for board in CELLS[won])
+    return value + MACRO_THREAT * _threats(won, FULL & ~(won | blocked))
+
+
+# MINI_VALUES[index(mine, theirs)] -> unweighted value of a mini-board for "mine"
+MINI_VALUES = tuple(_mini_value(*_masks(i)) for i in range(3 ** 9))
+
+# MACRO_VALUES[index(won, blocked)] -> value of one player's won mini-boards
+MACRO_VALUES = tuple(_macro_value(*_masks(i)) for i in range(3 ** 9))
+
+
+def evaluate(state):
+    """Static score of the position from the side to move's point of view"""
+    side = state.side
+    mine, theirs = state.cells[side], state.cells[side ^ 1]
+    my_macro, their_macro = state.macro[side], state.macro[side ^ 1]
+    drawn = state.closed & ~(my_macro | their_macro)
+
+    score = (
+        MACRO_VALUES[TERNARY[my_macro] + 2 * TERNARY[their_macro | drawn]]
+        - MACRO_VALUES[TERNARY[their_macro] + 2 * TERNARY[my_macro | drawn]]
+    )
+    for board in range(9):
+        score += MACRO_WEIGHTS[board] * MINI_VALUES[TERNARY[mine[board]] + 2 * TERNARY[theirs[board]]]
+    return score
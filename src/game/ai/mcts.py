@@ -0,0 +1,210 @@
+"""Monte Carlo Tree Search (UCT) over the headless GameState.
+
+Each iteration walks the tree with UCT, expands one untried move, plays the
+rest of the game out at random and backs the result up the path. The tree
+is kept between moves: the next search starts from the subtree of the moves
+that were actually played, so earlier playouts (including those made while
+pondering on the opponent's time) keep counting.
+"""
+
+import math
+import random
+import time
+from game.core.engine import PLAYERS
+
+
+class Node:
+    __slots__ = ("move", "parent", "children", "untried", "visits", "wins", "side", "hash")
+
+    def __init__(self, state, move=None, parent=None, rng=random):
+        self.move = move
+        self.parent = parent
+        self.children = {}
+        self.untried = list(state.legal_moves())
+        rng.shuffle(self.untried)
+        self.visits = 0
+        self.wins = 0.0  # From the point of view of the side that moved into this node
+        self.side = state.side ^ 1
+        self.hash = state.hash
+
+    def select_child(self, exploration):
+        log_visits = math.log(self.visits)
+        best, best_value = None, -1.0
+        for child in self.children.values():
+            value = child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best, best_value = child, value
+        return best
+
+
+class MCTSEngine:
+    def __init__(self, playouts=None, time_limit=1.0, exploration=1.4, seed=None, endgame=None):
+        # Stop at whichever budget runs out first; at least one must be set
+        self.playouts = playouts
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.endgame = endgame  # Optional EndgameSolver tried before searching
+        self.pondering = False  # Yield the GIL regularly so the GUI thread stays responsive
+        self.root = None
+        self.last_playouts = 0
+        self.last_elapsed = 0.0
+        self.reused_visits = 0  # Root visits carried over from earlier searches and pondering
+        self.source = None  # How the last move was chosen: "endgame", "endgame cache" or "search"
+
+    def reset(self):
+        self.root = None
+
+    def advance(self, move):
+        """Move the root into the subtree for a move that was played, dropping the rest"""
+        if self.root is None:
+            return
+        child = self.root.children.get(move)
+        if child is not None:
+            child.parent = None
+        self.root = child
+
+    def _sync_root(self, state):
+        """Descend through moves played since the last search, or start a fresh tree"""
+        root = self.root
+        if root is not None and root.hash != state.hash:
+            # Find where the tree's root sits in the game history and replay from there
+            for ply, entry in enumerate(state.history):
+                if entry[5] == root.hash:
+                    for later in state.history[ply:]:
+                        self.advance(later[0])
+                        if self.root is None:
+                            break
+                    break
+            else:
+                self.root = None
+
+        if self.root is None or self.root.hash != state.hash:
+            self.root = Node(state, rng=self.rng)
+
+    def search(self, state, cancel=None, time_limit=None, playouts=None):
+        """Return the most visited move for the side to move, or None if there are no moves.
+
+        ``cancel`` is an optional threading.Event; setting it stops the search early.
+        ``time_limit`` and ``playouts`` override the engine's per-move budget for this call.
+        """
+        self.last_playouts = 0
+        self.last_elapsed = 0.0
+        self.reused_visits = 0
+        self.source = None
+        moves = state.legal_moves()
+        if not moves:
+            return None
+
+        if time_limit is None:
+            time_limit = self.time_limit
+        if playouts is None:
+            playouts = self.playouts
+        deadline = time.perf_counter() + time_limit if time_limit else None
+        if self.endgame is not None:
+            # The solve counts against this move's budget; half is kept back for the playouts
+            move = self.endgame.best_move(state, time_limit / 2 if time_limit else None, cancel)
+            if move is not None:
+                self.source = self.endgame.source
+                return move
+
+        self._sync_root(state)
+        self.reused_visits = self.root.visits
+        self.source = "search"
+        state = state.copy()
+        root = self.root
+        start = time.perf_counter()
+        count = 0
+
+        while True:
+            self._iterate(root, state)
+            count += 1
+            if playouts is not None and count >= playouts:
+                break
+            # Checking the clock every playout is cheap next to the playout itself
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if cancel is not None and cancel.is_set():
+                break
+            if self.pondering and not count & 15:
+                time.sleep(0)  # Let the GUI thread take the GIL between playouts
+
+        self.last_playouts = count
+        self.last_elapsed = time.perf_counter() - start
+
+        best = max(root.children.values(), key=lambda child: child.visits)
+        return best.move
+
+    def ponder(self, state, cancel):
+        """Grow the tree for the opponent's position until cancelled; their reply's subtree is kept"""
+        self.pondering = True
+        try:
+            return self.search(state, cancel=cancel, time_limit=math.inf)
+        finally:
+            self.pondering = False
+
+    def _iterate(self, root, state):
+        node = root
+        depth = 0
+        rng = self.rng
+
+        # Selection
+        while not node.untried and node.children:
+            node = node.select_child(self.exploration)
+            state.make_move(node.move)
+            depth += 1
+
+        # Expansion
+        if node.untried:
+            move = node.untried.pop()
+            state.make_move(move)
+            depth += 1
+            child = Node(state, move, node, rng)
+            node.children[move] = child
+            node = child
+
+        # Playout
+        while state.result is None:
+            state.make_move(rng.choice(state.legal_moves()))
+            depth += 1
+        result = state.result
+
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            if result == "Draw":
+                node.wins += 0.5
+            elif result == PLAYERS[node.side]:
+                node.wins += 1.0
+            node = node.parent
+
+        for _ in range(depth):
+            state.unmake_move()
+
+    def playouts_per_second(self):
+        return self.last_playouts / self.last_elapsed if self.last_elapsed else 0.0
+
+    def principal_depth(self):
+        """Length of the most visited line in the tree"""
+        depth = 0
+        node = self.root
+        while node is not None and node.children:
+            node = max(node.children.values(), key=lambda child: child.visits)
+            depth += 1
+        return depth
+
+    def reuse_rate(self):
+        """Share of the root's visits that the last search inherited rather than ran"""
+        total = self.reused_visits + self.last_playouts
+        return self.reused_visits / total if total else None
+
+    def stats(self):
+        return {
+            "playouts": self.last_playouts,
+            "elapsed": self.last_elapsed,
+            "playouts_per_second": self.playouts_per_second(),
+            "root_visits": self.root.visits if self.root is not None else 0,
+            "depth": self.principal_depth(),
+            "source": self.source,
+            "cache_hit_rate": self.reuse_rate(),
+        }
@@ -0,0 +1,166 @@
+"""Opening book stored as a sorted binary file and read through mmap.
+
+The file is a small header followed by fixed-size records of (canonical
+hash, best move), sorted by hash. Each record covers a whole symmetry class,
+with the move stored in the canonical frame. Lookups binary-search the mapped
+file directly, so opening the book costs nothing up front and every process
+that maps it shares the same pages.
+
+Build it offline with the Expert search (run from ``src``):
+
+    python -m game.ai.opening_book --depth 3 --think-time 0.5
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import tempfile
+import time
+from pathlib import Path
+from game.core.engine import GameState
+from game.core.symmetry import canonical_key, transform_move, restore_move
+from .search import SearchEngine
+from .transposition import TranspositionTable
+
+BOOK_PATH = Path(__file__).resolve().parent.parent / "data" / "opening_book.bin"
+
+MAGIC = b"STTB"
+VERSION = 2  # 2: keyed by symmetry class
+HEADER = struct.Struct("<4sII")  # Magic, version, record count
+RECORD = struct.Struct("<QB")  # Canonical position hash, move index in the canonical frame
+
+_default_book = None
+
+
+class OpeningBook:
+    def __init__(self, path=BOOK_PATH):
+        self.path = Path(path)
+        self.count = 0
+        self._file = None
+        self._map = None
+
+        if not self.path.exists() or self.path.stat().st_size < HEADER.size:
+            return  # No book built yet; every lookup misses
+
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            return
+        self.count = count
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def probe(self, key):
+        """Return the book move for a canonical hash (in the canonical frame), or None"""
+        lo, hi = 0, self.count
+        data = self._map
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key, move = RECORD.unpack_from(data, HEADER.size + mid * RECORD.size)
+            if mid_key < key:
+                lo = mid + 1
+            elif mid_key > key:
+                hi = mid
+            else:
+                return move
+        return None
+
+    def lookup(self, state):
+        """Return the book move for the position if there is one and it is legal"""
+        if not self.count:
+            return None
+        key, transform = canonical_key(state)
+        move = self.probe(key)
+        if move is None:
+            return None
+        move = restore_move(move, transform)
+        return move if state.is_legal(move) else None
+
+
+def get_default_book():
+    """The shared book at BOOK_PATH, mapped once per process"""
+    global _default_book
+    if _default_book is None:
+        _default_book = OpeningBook()
+    return _default_book
+
+
+def write_book(entries, path=BOOK_PATH):
+    """Write a {canonical hash: canonical move} mapping as a sorted book file"""
+    path = Path(path)
+    # Running games map the current file, and truncating a mapped file makes their reads
+    # fault, so write a new file beside it and swap it in; existing maps keep the old one
+    with tempfile.NamedTemporaryFile("wb", dir=path.parent, prefix=path.name, delete=False) as f:
+        try:
+            f.write(HEADER.pack(MAGIC, VERSION, len(entries)))
+            for key in sorted(entries):
+                f.write(RECORD.pack(key, entries[key]))
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+    os.chmod(f.name, 0o644)  # Temporary files start out private
+    os.replace(f.name, path)
+
+
+def build_book(depth, think_time, table_mb=64, progress=None):
+    """Search one position per symmetry class up to ``depth`` plies in.
+
+    Returns {canonical hash: best move in the canonical frame}.
+    """
+    engine = SearchEngine(time_limit=think_time, table=TranspositionTable(size_mb=table_mb))
+    entries = {}
+    frontier = [GameState()]
+
+    for ply in range(depth + 1):
+        next_frontier = []
+        for index, state in enumerate(frontier):
+            key, transform = canonical_key(state)
+            if key in entries or state.winner() is not None:
+                continue
+
+            entries[key] = transform_move(engine.search(state), transform)
+            if progress:
+                progress(ply, index + 1, len(frontier))
+
+            if ply < depth:
+                for move in state.legal_moves():
+                    child = state.copy()
+                    child.make_move(move)
+                    next_frontier.append(child)
+        frontier = next_frontier
+
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Super Tic Tac Toe opening book")
+    parser.add_argument("--depth", type=int, default=3, help="plies from the start to cover")
+    parser.add_argument("--think-time", type=float, default=0.5, help="search seconds per position")
+    parser.add_argument("--output", type=Path, default=BOOK_PATH)
+    args = parser.parse_args()
+
+    def progress(ply, done, total):
+        print(f"\rply {ply}: {done}/{total}", end="", flush=True)
+
+    start = time.perf_counter()
+    entries = build_book(args.depth, args.think_time, progress=progress)
+    write_book(entries, args.output)
+    print(f"\nWrote {len(entries)} positions to {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Root-parallel MCTS across a process pool.
+
+Every worker process owns an MCTSEngine for the lifetime of the pool and
+runs an independent search on the same position; the parent adds up the
+root visit counts and plays the most visited move. Workers keep their own
+trees between moves, and the pool is only started once per game, so a move
+costs one round trip per worker rather than a process spawn.
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from .mcts import MCTSEngine
+
+WORKERS_ENV = "STTT_MCTS_WORKERS"
+
+_engine = None  # The worker process's own search tree
+
+
+def _init_worker(exploration):
+    global _engine
+    # No seed: each process draws its own from the OS so the searches differ
+    _engine = MCTSEngine(exploration=exploration)
+
+
+def _worker_search(state, playouts, time_limit):
+    _engine.playouts = playouts
+    _engine.time_limit = time_limit
+    _engine.search(state)
+    visits = {move: child.visits for move, child in _engine.root.children.items()}
+    return visits, _engine.last_playouts, _engine.reused_visits, _engine.principal_depth()
+
+
+def workers_from_environment():
+    """Worker count from STTT_MCTS_WORKERS; 1 (no pool) if it is unset or not a positive number"""
+    value = os.environ.get(WORKERS_ENV, "").strip()
+    try:
+        workers = int(value or "1")
+    except ValueError:
+        print(f"Ignoring {WORKERS_ENV}={value!r}: not a whole number", file=sys.stderr)
+        return 1
+    return max(workers, 1)
+
+
+class ParallelMCTS:
+    def __init__(self, workers=None, playouts=None, time_limit=1.0, exploration=1.4, endgame=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.playouts = playouts  # Per worker
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.endgame = endgame  # Optional EndgameSolver tried in this process first
+        self.pool = None
+        self.last_playouts = 0
+        self.last_elapsed = 0.0
+        self.reused_visits = 0  # Summed over workers
+        self.depth = 0  # Deepest most-visited line among the workers
+        # How the last move was chosen: "forced", "endgame", "endgame cache" or "search"
+        self.source = None
+
+    def start(self):
+        if self.pool is None:
+            # Spawn rather than fork: forking a process that is running Qt is unsafe
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.exploration,),
+            )
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    def reset(self):
+        # Worker trees re-sync to whatever position they are given next
+        self.last_playouts = 0
+        self.last_elapsed = 0.0
+        self.reused_visits = 0
+        self.depth = 0
+        self.source = None
+
+    def search(self, state, cancel=None, time_limit=None, playouts=None):
+        """Return the move with the most root visits summed over all workers.
+
+        Workers can't be interrupted mid-search; once ``cancel`` is set the
+        remaining results are dropped and None is returned. ``time_limit`` and
+        ``playouts`` override the engine's per-move budget for this call.
+        """
+        self.reset()
+        moves = state.legal_moves()
+        if not moves:
+            return None
+        if len(moves) == 1:
+            self.source = "forced"
+            return moves[0]
+
+        if time_limit is None:
+            time_limit = self.time_limit
+        if playouts is None:
+            playouts = self.playouts
+        if self.endgame is not None:
+            # The solve counts against this move's budget; half is kept back for the workers
+            solve_start = time.perf_counter()
+            move = self.endgame.best_move(state, time_limit / 2 if time_limit else None, cancel)
+            if move is not None:
+                self.source = self.endgame.source
+                return move
+            if time_limit:
+                time_limit -= time.perf_counter() - solve_start
+        if cancel is not None and cancel.is_set():
+            return None
+
+        self.start()
+        start = time.perf_counter()
+        futures = [
+            self.pool.submit(_worker_search, state, playouts, time_limit)
+            for _ in range(self.workers)
+        ]
+
+        visits = Counter()
+        playouts = reused = depth = 0
+        for future in futures:
+            worker_visits, worker_playouts, worker_reused, worker_depth = future.result()
+            if cancel is not None and cancel.is_set():
+                return None
+            visits.update(worker_visits)
+            playouts += worker_playouts
+            reused += worker_reused
+            depth = max(depth, worker_depth)
+
+        self.source = "search"
+        self.reused_visits = reused
+        self.depth = depth
+        self.last_playouts = playouts
+        self.last_elapsed = time.perf_counter() - start
+        return visits.most_common(1)[0][0]
+
+    def playouts_per_second(self):
+        return self.last_playouts / self.last_elapsed if self.last_elapsed else 0.0
+
+    def reuse_rate(self):
+        """Share of the workers' root visits inherited from their earlier searches"""
+        total = self.reused_visits + self.last_playouts
+        return self.reused_visits / total if total else None
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "playouts": self.last_playouts,
+            "elapsed": self.last_elapsed,
+            "playouts_per_second": self.playouts_per_second(),
+            "depth": self.depth,
+            "source": self.source,
+            "cache_hit_rate": self.reuse_rate(),
+        }
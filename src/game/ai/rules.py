@@ -0,0 +1,121 @@
+"""Rule-based move choice for the Easy, Medium and Hard AIs.
+
+Every function works on a headless GameState and plays for the side to
+move. Randomness comes from ``rng`` (the ``random`` module unless a seeded
+``random.Random`` is passed), so games can be replayed exactly.
+"""
+
+import random
+from game.core.tables import WIN, COMPLETING
+
+
+def random_move(state, rng=random):
+    moves = state.legal_moves()
+    return rng.choice(moves) if moves else None
+
+
+def medium_move(state, rng=random):
+    moves = state.legal_moves()
+    if not moves:
+        return None
+
+    us, them = state.side, state.side ^ 1
+
+    # Try to win a mini-game
+    for move in moves:
+        if _wins_mini_game(state, move, us):
+            return move
+
+    # Try to block the opponent from winning a mini-game
+    for move in moves:
+        if _wins_mini_game(state, move, them):
+            return move
+
+    # Otherwise random
+    return rng.choice(moves)
+
+
+# Hard's move priorities, highest first. Creating or blocking a two-in-a-row on
+# the main board needs a mini-game win, so those moves already rank as
+# WIN_MINI or BLOCK_MINI and the steps never need checking on their own.
+WIN_OVERALL, BLOCK_OVERALL, WIN_MINI, BLOCK_MINI, NO_PRIORITY = 4, 3, 2, 1, 0
+
+# The center mini-board, and the center square of every mini-board
+CENTER_MOVES = frozenset(move for move in range(81) if move // 9 == 4 or move % 9 == 4)
+
+
+def hard_move(state, rng=random, book=None, endgame=None):
+    moves = state.legal_moves()
+    if not moves:
+        return None
+
+    # 0. Play from the opening book, or perfectly once the endgame is small enough to solve
+    if book is not None:
+        move = book.lookup(state)
+        if move is not None:
+            return move
+    if endgame is not None:
+        move = endgame.best_move(state)
+        if move is not None:
+            return move
+
+    us, them = state.side, state.side ^ 1
+    mine, theirs = state.cells[us], state.cells[them]
+    my_macro, their_macro = state.macro[us], state.macro[them]
+
+    def priority(move):
+        board, cell = divmod(move, 9)
+        bit = 1 << board
+        if COMPLETING[mine[board]] >> cell & 1:
+            # 1. Win the overall game, or 3. win a mini-game to build position
+            if WIN[my_macro | bit]:
+                return WIN_OVERALL
+            if COMPLETING[theirs[board]] >> cell & 1 and WIN[their_macro | bit]:
+                return BLOCK_OVERALL
+            return WIN_MINI
+        if COMPLETING[theirs[board]] >> cell & 1:
+            # 2. Block the opponent from winning the overall game, or 4. from winning a mini-game
+            return BLOCK_OVERALL if WIN[their_macro | bit] else BLOCK_MINI
+        return NO_PRIORITY
+
+    # max() keeps the first of equal moves, like taking the first match in move order
+    move = max(moves, key=priority)
+    if priority(move) != NO_PRIORITY:
+        return move
+
+    # 7. AVOID sending opponent to won/full boards (gives them freedom)
+    closed = state.closed
+    constrained_moves = [m for m in moves if not closed >> (m % 9) & 1]
+    if constrained_moves:
+        moves = constrained_moves
+
+    # 8. Prefer center positions (stronger strategic value)
+    center_moves = [m for m in moves if m in CENTER_MOVES]
+    if center_moves:
+        return rng.choice(center_moves)
+
+    # 9. Fall back to random from remaining moves
+    return rng.choice(moves)
+
+
+class HardEngine:
+    """hard_move behind the engine interface, so a slow endgame solve can run on the AI thread"""
+
+    def __init__(self, endgame, rng=random):
+        self.endgame = endgame
+        self.rng = rng
+        self.source = "rules"
+
+    def search(self, state, cancel=None):
+        move = self.endgame.best_move(state, cancel=cancel)
+        self.source = self.endgame.source if move is not None else "rules"
+        return move if move is not None else hard_move(state, self.rng)
+
+    def stats(self):
+        return dict(self.endgame.stats(), source=self.source)
+
+
+def _wins_mini_game(state, move, side):
+    """Check if move wins a mini-game"""
+    board, cell = divmod(move, 9)
+    return bool(COMPLETING[state.cells[side][board]] >> cell & 1)
@@ -0,0 +1,391 @@
+"""Alpha-beta search for the Expert difficulty.
+
+Negamax with iterative deepening over a headless GameState. Each depth is
+searched to completion if time allows; when the deadline passes mid-depth
+the best move from the last finished depth is returned, so the time spent
+per move stays bounded however complex the position is. An optional
+transposition table carries results between depths and between moves, which
+is also how pondering on the opponent's time pays off on the next move.
+Table entries are keyed by symmetry class, with their moves stored in the
+canonical frame, so the 8 rotations and reflections of a position share one.
+
+Moves are tried best-first: the table move, then moves that win a mini-game,
+then the killer moves that caused cutoffs at the same ply, then by history
+score. Moves that send the opponent to a closed mini-board (a free choice) or
+to one they can win at once go last, and sends to a nearly full mini-board go
+first among equals. ``stats()`` reports the nodes per iteration and the
+effective branching factor, which is how well the ordering is doing.
+"""
+
+import math
+import time
+from game.core.symmetry import canonical_key, transform_move, restore_move
+from game.core.tables import COMPLETING, CELLS
+from .evaluation import evaluate
+from .transposition import EXACT, LOWER, UPPER
+
+WIN_SCORE = 100000
+INFINITY = WIN_SCORE + 1000
+MATE_BOUND = WIN_SCORE - 100  # Scores beyond this are forced wins/losses
+
+# Move ordering keys. History scores stay below HISTORY_LIMIT and are shifted past the
+# fullness bonus; risky sends drop below every other quiet move.
+ORDER_WIN = 1 << 29
+ORDER_KILLERS = (1 << 28, 1 << 27)
+ORDER_RISKY = -(1 << 26)
+HISTORY_LIMIT = 1 << 20
+
+# FULLNESS[empty mask] -> how few empty cells a mini-board has left
+FULLNESS = tuple(9 - len(CELLS[mask]) for mask in range(512))
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def _to_table(score, ply):
+    # Win/loss scores count plies from the root; store them relative to this node
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _from_table(score, ply):
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+class SearchEngine:
+    def __init__(self, time_limit=0.15, max_depth=64, table=None, instant_depth=8, endgame=None):
+        self.time_limit = time_limit  # Seconds per move
+        self.max_depth = max_depth
+        self.table = table  # Optional TranspositionTable shared across moves
+        # Play a table move without searching if it was already searched exactly this deep
+        self.instant_depth = instant_depth
+        self.endgame = endgame  # Optional EndgameSolver tried before searching
+        self.deadline = 0.0
+        self.cancel = None
+        self.pondering = False  # Yield the GIL regularly so the GUI thread stays responsive
+        self.nodes = 0
+        self.depth_reached = 0
+        self.iteration_nodes = []  # Nodes searched by each completed depth
+        # How the last move was chosen: "forced", "endgame", "endgame cache", "table" or "search"
+        self.source = None
+        self.table_start = (0, 0)  # Table hits and misses when the last search started
+        self.killers = [[None, None] for _ in range(max_depth + 2)]  # Per ply
+        self.history = [[0] * 81, [0] * 81]  # Per side, per move: cutoffs weighted by depth
+
+    def search(self, state, cancel=None, time_limit=None):
+        """Return the best move index for the side to move, or None if there are no moves.
+
+        ``cancel`` is an optional threading.Event; setting it stops the search early.
+        ``time_limit`` overrides the engine's per-move budget for this call.
+        """
+        self._reset_stats()
+        self.pondering = False
+        moves = list(state.legal_moves())
+        if not moves:
+            return None
+        if len(moves) == 1:
+            self.source = "forced"
+            return moves[0]
+
+        start = time.perf_counter()
+        if time_limit is None:
+            time_limit = self.time_limit
+        if self.endgame is not None:
+            # The solve counts against this move's budget; half is kept back for the search
+            move = self.endgame.best_move(state, time_limit / 2, cancel)
+            if move is not None:
+                self.source = self.endgame.source
+                return move
+
+        # Search a private copy; an aborted depth leaves moves on the stack
+        state = state.copy()
+        self.deadline = start + time_limit
+        self.cancel = cancel
+        self._new_search()
+        self.source = "search"
+        moves = self._order(state, moves, 0)
+        best_move = moves[0]
+        start_depth = 1
+        if self.table is not None:
+            self.table.new_search()
+            entry, table_move = self._probe(state)
+            if entry is not None and table_move in moves:
+                best_move = table_move
+                moves.remove(best_move)
+                moves.insert(0, best_move)
+                if entry[3] == EXACT:
+                    # Pondering already searched this position; answer at once if it went
+                    # deep enough, otherwise carry on from the depth it reached
+                    self.depth_reached = entry[1]
+                    if entry[1] >= self.instant_depth or abs(entry[2]) >= MATE_BOUND:
+                        self.source = "table"
+                        return best_move
+                    start_depth = entry[1] + 1
+
+        for depth in range(start_depth, self.max_depth + 1):
+            start_nodes = self.nodes
+            try:
+                best_move, score = self._search_root(state, moves, depth)
+            except SearchTimeout:
+                break
+
+            self.depth_reached = depth
+            self.iteration_nodes.append(self.nodes - start_nodes)
+            if abs(score) >= MATE_BOUND:
+                break  # Forced result found, deeper search won't change it
+
+            # Try the previous best move first at the next depth
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+
+        return best_move
+
+    def ponder(self, state, cancel):
+        """Search every reply to the opponent's position until cancelled.
+
+        Replies are deepened one depth at a time, most dangerous first, and each
+        leaves an exact table entry that search() picks up once the reply is played.
+        """
+        if self.table is None:
+            return None
+
+        state = state.copy()
+        self.deadline = math.inf
+        self.cancel = cancel
+        self._new_search()
+        self.table.new_search()
+        replies = list(state.legal_moves())
+        scores = {}
+        self.pondering = True
+
+        for depth in range(1, self.max_depth + 1):
+            start_nodes = self.nodes
+            for reply in replies:
+                state.make_move(reply)
+                moves = list(state.legal_moves())
+                if moves:
+                    _, table_move = self._probe(state)
+                    moves = self._order(state, moves, 0)
+                    if table_move in moves:
+                        moves.remove(table_move)
+                        moves.insert(0, table_move)
+                    try:
+                        _, scores[reply] = self._search_root(state, moves, depth)
+                    except SearchTimeout:
+                        return None
+                state.unmake_move()
+
+            self.depth_reached = depth
+            self.iteration_nodes.append(self.nodes - start_nodes)
+            # The replies that leave us worst off are the ones a good opponent plays
+            replies.sort(key=lambda reply: scores.get(reply, 0))
+
+        return None
+
+    def stats(self):
+        return {
+            "nodes": self.nodes,
+            "depth_reached": self.depth_reached,
+            "iteration_nodes": self.iteration_nodes,
+            "effective_branching_factor": self.effective_branching_factor(),
+            "source": self.source,
+            "cache_hit_rate": self.cache_hit_rate(),
+        }
+
+    def effective_branching_factor(self):
+        """How many times more nodes the last completed depth took than the one before"""
+        if len(self.iteration_nodes) < 2 or not self.iteration_nodes[-2]:
+            return None
+        return self.iteration_nodes[-1] / self.iteration_nodes[-2]
+
+    def cache_hit_rate(self):
+        """Share of the last search's table probes that found an entry, or None if it made none"""
+        if self.table is None:
+            return None
+        hits = self.table.hits - self.table_start[0]
+        probes = hits + self.table.misses - self.table_start[1]
+        return hits / probes if probes > 0 else None
+
+    def _reset_stats(self):
+        self.nodes = 0
+        self.depth_reached = 0
+        self.iteration_nodes = []
+        self.source = None
+        if self.table is not None:
+            self.table_start = (self.table.hits, self.table.misses)
+
+    def _new_search(self):
+        self._reset_stats()
+        for killers in self.killers:
+            killers[0] = killers[1] = None
+        # Keep what earlier moves learned, but let this search outweigh it
+        for history in self.history:
+            for move in range(81):
+                history[move] >>= 1
+
+    def _order(self, state, moves, ply):
+        """Sort moves best-first for the side to move at ``ply``"""
+        side = state.side
+        mine, theirs = state.cells[side], state.cells[side ^ 1]
+        empty = state.empty
+        closed = state.closed
+        killers = self.killers[ply]
+        history = self.history[side]
+
+        def key(move):
+            board, cell = divmod(move, 9)
+            if COMPLETING[mine[board]] >> cell & 1:
+                return ORDER_WIN
+            if move == killers[0]:
+                return ORDER_KILLERS[0]
+            if move == killers[1]:
+                return ORDER_KILLERS[1]
+            if closed >> cell & 1 or COMPLETING[theirs[cell]] & empty[cell]:
+                return ORDER_RISKY + history[move]
+            return (history[move] << 4) + FULLNESS[empty[cell]]
+
+        moves.sort(key=key, reverse=True)
+        return moves
+
+    def _ordered_moves(self, state, moves, table_move, depth, ply):
+        """Yield moves best-first, trying the table move before doing any ordering work"""
+        if table_move is not None:
+            yield table_move
+        if depth > 1:
+            yield from self._order(state, [m for m in moves if m != table_move], ply)
+            return
+
+        # Right above the leaves sorting costs more than it saves; just hold back
+        # the sends that free the opponent or hand them a mini-game
+        theirs = state.cells[state.side ^ 1]
+        empty = state.empty
+        closed = state.closed
+        risky = []
+        for move in moves:
+            if move == table_move:
+                continue
+            cell = move % 9
+            if closed >> cell & 1 or COMPLETING[theirs[cell]] & empty[cell]:
+                risky.append(move)
+            else:
+                yield move
+        yield from risky
+
+    def _cutoff(self, state, move, depth, ply):
+        """Remember a quiet move that caused a beta cutoff"""
+        board, cell = divmod(move, 9)
+        if COMPLETING[state.cells[state.side][board]] >> cell & 1:
+            return  # Mini-game wins are ordered early anyway
+
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+
+        history = self.history[state.side]
+        history[move] += depth * depth
+        if history[move] >= HISTORY_LIMIT:
+            for other in range(81):
+                history[other] >>= 1
+
+    def _search_root(self, state, moves, depth):
+        alpha = -INFINITY
+        best_move = moves[0]
+
+        for move in moves:
+            state.make_move(move)
+            score = -self._negamax(state, depth - 1, -INFINITY, -alpha, 1)
+            state.unmake_move()
+
+            if score > alpha:
+                alpha = score
+                best_move = move
+
+        if self.table is not None:
+            key, transform = canonical_key(state)
+            self.table.store(key, depth, alpha, EXACT, transform_move(best_move, transform))
+        return best_move, alpha
+
+    def _probe(self, state):
+        """Return the table entry for the position and its move mapped back onto it"""
+        key, transform = canonical_key(state)
+        entry = self.table.probe(key)
+        if entry is None or entry[4] is None:
+            return entry, None
+        return entry, restore_move(entry[4], transform)
+
+    def _negamax(self, state, depth, alpha, beta, ply):
+        self.nodes += 1
+        if not self.nodes & 1023:
+            if self.pondering:
+                time.sleep(0)
+            if time.perf_counter() >= self.deadline or self.cancel is not None and self.cancel.is_set():
+                raise SearchTimeout
+
+        result = state.result
+        if result is not None:
+            if result == "Draw":
+                return 0
+            # The previous mover won; prefer the quickest win / slowest loss
+            return ply - WIN_SCORE
+
+        if depth == 0:
+            return evaluate(state)
+
+        table = self.table
+        table_move = None
+        alpha_start = alpha
+        if table is not None:
+            key, transform = canonical_key(state)
+            entry = table.probe(key)
+            if entry is not None:
+                if entry[4] is not None:
+                    table_move = restore_move(entry[4], transform)
+                if entry[1] >= depth:
+                    score = _from_table(entry[2], ply)
+                    bound = entry[3]
+                    if (bound == EXACT
+                            or (bound == LOWER and score >= beta)
+                            or (bound == UPPER and score <= alpha)):
+                        return score
+
+        moves = state.legal_moves()
+        if table_move is not None and table_move not in moves:
+            table_move = None  # Hash collision
+
+        best = -INFINITY
+        best_move = None
+        for move in self._ordered_moves(state, moves, table_move, depth, ply):
+            state.make_move(move)
+            score = -self._negamax(state, depth - 1, -beta, -alpha, ply + 1)
+            state.unmake_move()
+
+            if score > best:
+                best = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self._cutoff(state, move, depth, ply)
+                        break
+
+        if table is not None:
+            if best <= alpha_start:
+                bound = UPPER
+            elif best >= beta:
+                bound = LOWER
+            else:
+                bound = EXACT
+            if best_move is not None:
+                best_move = transform_move(best_move, transform)
+            table.store(key, depth, _to_table(best, ply), bound, best_move)
+
+        return best
@@ -0,0 +1,120 @@
+"""Per-move AI telemetry.
+
+Every AI move leaves one record: how long the AI took to choose it, where
+the move came from (the opening book, the endgame solver, a table hit, a
+search or the rule-based players), the nodes searched or playouts run, the
+depth reached and the transposition table hit rate (the share of the tree
+reused from earlier searches, for MCTS). Records are kept in a fixed-size
+ring buffer in memory, so the overlay can show recent moves without the
+history growing over a long session.
+
+Setting ``STTT_TELEMETRY_FILE`` (or passing ``sink``) also appends every
+record as a line of JSON to that file, tagged with the host name, so runs
+on several machines can be concatenated and compared.
+"""
+
+import json
+import os
+import platform
+import threading
+import time
+from collections import deque
+
+SINK_ENV = "STTT_TELEMETRY_FILE"
+
+# Upper edges of the latency histogram buckets, in milliseconds; the last one is open-ended
+LATENCY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf"))
+
+_default_telemetry = None
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers, or None if it is empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Telemetry:
+    def __init__(self, capacity=256, sink=None):
+        self.records = deque(maxlen=capacity)  # Oldest records drop off the front
+        self.sink = sink  # Optional JSONL file path
+        self.host = platform.node()
+        self.lock = threading.Lock()
+
+    def record(self, difficulty, source, wall_time, nodes=None, depth=None, cache_hit_rate=None):
+        """Add one move's figures; ``wall_time`` is in seconds"""
+        entry = {
+            "time": time.time(),
+            "difficulty": difficulty,
+            "source": source,
+            "wall_ms": wall_time * 1000,
+            "nodes": nodes,
+            "depth": depth,
+            "cache_hit_rate": cache_hit_rate,
+        }
+        with self.lock:
+            self.records.append(entry)
+            if self.sink:
+                self._write(entry)
+        return entry
+
+    def _write(self, entry):
+        try:
+            with open(self.sink, "a") as f:
+                f.write(json.dumps(dict(entry, host=self.host)) + "\n")
+        except OSError:
+            self.sink = None  # Stop trying rather than fail every move
+
+    def latest(self):
+        with self.lock:
+            return self.records[-1] if self.records else None
+
+    def snapshot(self, difficulty=None):
+        """A list copy of the buffered records, optionally for one difficulty"""
+        with self.lock:
+            records = list(self.records)
+        if difficulty is not None:
+            records = [entry for entry in records if entry["difficulty"] == difficulty]
+        return records
+
+    def latencies(self, difficulty=None):
+        return [entry["wall_ms"] for entry in self.snapshot(difficulty)]
+
+    def percentiles(self, difficulty=None):
+        """(p50, p95) move latency in milliseconds"""
+        latencies = self.latencies(difficulty)
+        return percentile(latencies, 0.5), percentile(latencies, 0.95)
+
+    def histogram(self, difficulty=None):
+        """Move counts per LATENCY_BUCKETS bucket"""
+        counts = [0] * len(LATENCY_BUCKETS)
+        for latency in self.latencies(difficulty):
+            for bucket, edge in enumerate(LATENCY_BUCKETS):
+                if latency <= edge:
+                    counts[bucket] += 1
+                    break
+        return counts
+
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+
+    def stats(self):
+        p50, p95 = self.percentiles()
+        return {
+            "moves": len(self.records),
+            "capacity": self.records.maxlen,
+            "p50_ms": p50,
+            "p95_ms": p95,
+            "sink": self.sink,
+        }
+
+
+def get_default_telemetry():
+    """One buffer per process, writing to STTT_TELEMETRY_FILE if it is set"""
+    global _default_telemetry
+    if _default_telemetry is None:
+        _default_telemetry = Telemetry(sink=os.environ.get(SINK_ENV) or None)
+    return _default_telemetry
@@ -0,0 +1,89 @@
+"""Transposition table for the alpha-beta search.
+
+Entries are keyed by the engine's incremental Zobrist hash and live in a
+fixed number of slots derived from a memory cap, so the table never grows
+past its budget. A slot is overwritten when it is empty, holds the same
+position, was written during an earlier search, or holds a shallower result.
+"""
+
+EXACT = 0  # Score is exact
+LOWER = 1  # Search failed high, score is a lower bound
+UPPER = 2  # Search failed low, score is an upper bound
+
+# Rough cost of one filled slot: list pointer + entry tuple + 64-bit key int
+ENTRY_BYTES = 160
+
+
+class TranspositionTable:
+    def __init__(self, size_mb=16):
+        self.size_mb = size_mb
+        self.capacity = max(1, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+        self.slots = [None] * self.capacity
+        self.age = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0  # Slot held a different position
+        self.stores = 0
+        self.overwrites = 0  # A different position was evicted
+
+    def clear(self):
+        """Drop every entry, e.g. when a new game starts"""
+        self.slots = [None] * self.capacity
+        self.age = 0
+        self.reset_stats()
+
+    def new_search(self):
+        """Mark entries from earlier moves as old so they are replaced first"""
+        self.age = (self.age + 1) & 0xFF
+
+    def probe(self, key):
+        """Return (key, depth, score, bound, move, age) for the position, or None"""
+        entry = self.slots[key % self.capacity]
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] != key:
+            self.collisions += 1
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def store(self, key, depth, score, bound, move):
+        index = key % self.capacity
+        old = self.slots[index]
+
+        if old is not None and old[0] != key:
+            # Keep a deeper entry from the current search
+            if old[5] == self.age and old[1] > depth:
+                return
+            self.overwrites += 1
+        elif old is not None and move is None:
+            move = old[4]  # Keep the best move we already knew
+
+        self.slots[index] = (key, depth, score, bound, move, self.age)
+        self.stores += 1
+
+    def hit_rate(self):
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def filled(self):
+        return sum(1 for entry in self.slots if entry is not None)
+
+    def stats(self):
+        return {
+            "size_mb": self.size_mb,
+            "capacity": self.capacity,
+            "filled": self.filled(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+            "overwrites": self.overwrites,
+            "hit_rate": self.hit_rate(),
+        }
@@ -0,0 +1,39 @@
+import sys
+import traceback
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class AIWorkerSignals(QObject):
+    move_ready = pyqtSignal(int, object)  # Search generation, move index (or None)
+
+
+class AIWorker(QRunnable):
+    """Runs one engine search on a private state snapshot inside a QThreadPool"""
+
+    def __init__(self, engine, state, generation, cancel, ponder=False, limits=None):
+        super().__init__()
+        self.engine = engine
+        self.state = state
+        self.generation = generation
+        self.cancel = cancel  # threading.Event shared with the board
+        self.ponder = ponder  # Search the opponent's position until cancelled
+        self.limits = limits or {}  # Keyword overrides of the engine's per-move budget
+        self.signals = AIWorkerSignals()
+
+    def run(self):
+        # PyQt aborts the whole process if an exception escapes run(), so log it instead
+        try:
+            if self.ponder:
+                self.engine.ponder(self.state, self.cancel)
+                return
+
+            move = self.engine.search(self.state, cancel=self.cancel, **self.limits)
+        except Exception:
+            print("AI search failed:", file=sys.stderr)
+            traceback.print_exc()
+            if self.ponder:
+                return
+            move = None  # The board falls back to a rule-based move
+
+        # Queued back to the GUI thread, where stale generations are ignored
+        self.signals.move_ready.emit(self.generation, move)
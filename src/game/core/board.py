@@ -1,21 +1,32 @@
 from PyQt6.QtWidgets import QWidget, QGridLayout, QFrame, QSizePolicy
-from PyQt6.QtCore import QSize, QTimer, pyqtSignal
+from PyQt6.QtCore import QSize, QTimer, QThreadPool, pyqtSignal
 from .mini_game import MiniGame
+from .engine import GameState, SIDES, to_move, from_move
+from .tables import WIN
+from ..ai.search import SearchEngine
+from ..ai.transposition import TranspositionTable
+from ..ai.mcts import MCTSEngine
+from ..ai.parallel_mcts import ParallelMCTS, workers_from_environment
+from ..ai.worker import AIWorker
+from ..ai.opening_book import get_default_book
+from ..ai.endgame import get_default_solver
+from ..ai.telemetry import get_default_telemetry
+from ..ai import rules
 from ..ui.game_result import GameResultDialog
 from styling.colours import RED, BLUE, HIGHLIGHT, GRID
-import random
+import threading
 import time
 
 class Board(QWidget):
     turn_changed = pyqtSignal()  # Signal emitted when turn changes
     game_over = pyqtSignal()  # Signal emitted when game ends
+    ai_move_recorded = pyqtSignal(object)  # Telemetry record of each AI move
     
     def __init__(self, difficulty=None, parent=None, username=None):
         super().__init__(parent)
         
-        self.current_player = "X"
-        self.active_mini_game = None
-        self.difficulty = difficulty  # None, "Easy", "Medium", or "Hard"
+        self.state = GameState()
+        self.difficulty = difficulty  # None, "Easy", "Medium", "Hard", "Expert" or "MCTS"
         self.ai_player = "O"  # AI always plays as O
         self.human_player = "X"  # Human always plays as X
         self.username = username
@@ -23,6 +34,35 @@ class Board(QWidget):
         self.start_time = None  # Track when first move is made
         self.time_taken = 0  # Time taken to complete the game
         self.time_cap = 120  # 2 minutes time cap for scoring
+        self.think_time = 0.15  # Expert search budget per move, in seconds; read at every search
+        self.opening_book = get_default_book()  # Memory-mapped, shared by every board
+        self.endgame_solver = get_default_solver()  # Exact play once few moves remain
+        self.hard_engine = rules.HardEngine(self.endgame_solver)  # Hard's endgame solves, off the GUI thread
+        self.transposition_table = TranspositionTable(size_mb=16)  # Kept for the whole game
+        self.search_engine = SearchEngine(
+            time_limit=self.think_time, table=self.transposition_table, endgame=self.endgame_solver
+        )
+        self.mcts_playouts = None  # Optional playout cap per move for MCTS; read at every search
+        self.mcts_time_limit = 1.0  # MCTS budget per move, in seconds; read at every search
+        self.mcts_workers = workers_from_environment()  # >1 searches across a process pool
+        if self.mcts_workers > 1:
+            self.mcts_engine = ParallelMCTS(
+                workers=self.mcts_workers, playouts=self.mcts_playouts, time_limit=self.mcts_time_limit,
+                endgame=self.endgame_solver
+            )
+        else:
+            self.mcts_engine = MCTSEngine(
+                playouts=self.mcts_playouts, time_limit=self.mcts_time_limit, endgame=self.endgame_solver
+            )
+
+        # Searches run one at a time off the GUI thread; a newer generation cancels older ones
+        self.ai_pool = QThreadPool(self)
+        self.ai_pool.setMaxThreadCount(1)
+        self.ai_generation = 0
+        self.ai_cancel = None
+        self.closed = False  # Set by shutdown; no AI work starts after it
+        self.ai_started = 0.0  # When the AI started choosing its current move
+        self.telemetry = get_default_telemetry()
         
         outer_layout = QGridLayout(self)
         outer_layout.setContentsMargins(0, 0, 0, 0)
@@ -59,23 +99,29 @@ class Board(QWidget):
         self.update_playable_mini_games()
         self.update_mini_game_highlights()
 
+    @property
+    def current_player(self):
+        return self.state.current_player
+
+    @current_player.setter
+    def current_player(self, player):
+        if player != self.state.current_player:
+            self.state.pass_turn()
+
+    @property
+    def active_mini_game(self):
+        if self.state.active < 0:
+            return None
+        return divmod(self.state.active, 3)
+
     def handle_square_click(self, square, mini_game_row, mini_game_col):
         # If AI mode and it's AI's turn, ignore human clicks
         if self.difficulty is not None and self.current_player == self.ai_player:
             return
-            
-        clicked_mini_game = self.mini_games[mini_game_row][mini_game_col]
-        
-        # If an active mini_game is set, only allow moves inside it
-        if self.active_mini_game is not None:
-            if self.active_mini_game != (mini_game_row, mini_game_col):
-                return  # Ignore clicks outside the active mini_game
 
-        if square.state is not None:
+        # Ignores clicks outside the active mini-game, on taken squares and in won/full mini-games
+        if not self.state.is_legal(to_move(mini_game_row, mini_game_col, square.row, square.col)):
             return
-        
-        if clicked_mini_game.winner is not None or clicked_mini_game.is_full:
-            return  # Ignore clicks in a mini_game that already has a winner or is full
 
         self.make_move(square, mini_game_row, mini_game_col)
 
@@ -86,34 +132,19 @@ class Board(QWidget):
         
         clicked_mini_game = self.mini_games[mini_game_row][mini_game_col]
         
-        # Place the mark
-        square.set_state(self.current_player)
+        # Play the move on the engine, which also picks the next active mini-game
+        player = self.current_player
+        self.state.make_move(to_move(mini_game_row, mini_game_col, square.row, square.col))
 
-        # Check if this move won the mini-game
-        mini_game_winner = clicked_mini_game.check_winner()
-        
-        if mini_game_winner is not None or clicked_mini_game.is_full:
-            self.active_mini_game = None  # No active mini_game if the current one is won or full
-            self.update_mini_game_highlights()
-
-        # Determine the next active mini_game based on clicked square position
-        next_row, next_col = square.row, square.col
-        next_mini_game = self.mini_games[next_row][next_col]
-
-        # Only force the next mini-game if it's playable (not won and not full)
-        if next_mini_game.winner is None and not next_mini_game.is_full:
-            self.active_mini_game = (next_row, next_col)
-        else:
-            # If the target mini-game is won or full, player can go anywhere
-            self.active_mini_game = None
+        # Draw the mark and any mini-game win, as the engine's masks already record them
+        square.set_state(player)
+        board = mini_game_row * 3 + mini_game_col
+        clicked_mini_game.set_result(self.state.mini_game_winner(board), not self.state.empty[board])
 
         # Update highlights
         self.update_mini_game_highlights()
         self.update_playable_mini_games()
 
-        # Switch turns
-        self.current_player = "O" if self.current_player == "X" else "X"
-
         if self.current_player == "X":
             self.update_board_colour(RED)  # red for X
         else:
@@ -131,282 +162,133 @@ class Board(QWidget):
             QTimer.singleShot(200, self.ai_make_move)  # 10ms delay for better UX
 
     def ai_make_move(self):
+        # A delayed call can land after a restart, a skipped turn or the window closing
+        if self.closed or self.current_player != self.ai_player or self.state.winner() is not None:
+            return
+
+        self.ai_started = time.perf_counter()
+        source = "rules"
         if self.difficulty == "Easy":
             move = self.get_random_move()
         elif self.difficulty == "Medium":
             move = self.get_medium_move()
         elif self.difficulty == "Hard":
+            if self.endgame_solver.applies(self.state):
+                # Solving can take up to the solver's time limit, too long to block painting
+                self.start_ai_search(self.hard_engine)
+                return
             move = self.get_hard_move()
+        elif self.difficulty in ("Expert", "MCTS"):
+            move = self.get_book_move()
+            if move is None:
+                self.start_ai_search(self.ai_engine())
+                return
+            source = "book"
         else:
             return
         
+        self.record_ai_move(source)
+        self.play_ai_move(move)
+
+    def ai_engine(self):
+        if self.difficulty == "Hard":
+            return self.hard_engine
+        return self.search_engine if self.difficulty == "Expert" else self.mcts_engine
+
+    def record_ai_move(self, source, stats=None):
+        """Add the AI's move to the telemetry buffer, with the engine's figures if it searched"""
+        stats = stats or {}
+        entry = self.telemetry.record(
+            self.difficulty, stats.get("source") or source, time.perf_counter() - self.ai_started,
+            nodes=stats.get("nodes", stats.get("playouts")),
+            depth=stats.get("depth_reached", stats.get("depth")),
+            cache_hit_rate=stats.get("cache_hit_rate"),
+        )
+        self.ai_move_recorded.emit(entry)
+
+    def play_ai_move(self, move):
         if move:
             mini_game_row, mini_game_col, square_row, square_col = move
             mini_game = self.mini_games[mini_game_row][mini_game_col]
             square = mini_game.squares[square_row][square_col]
             self.make_move(square, mini_game_row, mini_game_col)
 
-    def get_available_moves(self):
-        moves = []
-        
-        if self.active_mini_game is not None:
-            # Only moves in the active mini-game
-            mg_row, mg_col = self.active_mini_game
-            mini_game = self.mini_games[mg_row][mg_col]
-            if mini_game.winner is None and not mini_game.is_full:
-                for r in range(3):
-                    for c in range(3):
-                        if mini_game.squares[r][c].state is None:
-                            moves.append((mg_row, mg_col, r, c))
+    def start_ai_search(self, engine, ponder=False):
+        """Search a snapshot of the position on the AI thread so the GUI keeps painting"""
+        if self.closed:
+            return
+        self.cancel_ai()
+        self.ai_cancel = threading.Event()
+        # Budgets are read here so changing them applies from the next move
+        limits = None
+        if not ponder and engine is self.search_engine:
+            limits = {"time_limit": self.think_time}
+        elif not ponder and engine is self.mcts_engine:
+            limits = {"time_limit": self.mcts_time_limit, "playouts": self.mcts_playouts}
+        worker = AIWorker(engine, self.state.copy(), self.ai_generation, self.ai_cancel, ponder, limits)
+        if not ponder:
+            worker.signals.move_ready.connect(self.on_ai_move_ready)
+        self.ai_pool.start(worker)
+
+    def start_pondering(self):
+        """Let the search AIs think on the human's time; their next search reuses the work"""
+        if self.closed or self.current_player != self.human_player or self.state.winner() is not None:
+            return
+
+        if self.difficulty == "Expert":
+            self.start_ai_search(self.search_engine, ponder=True)
+        elif self.difficulty == "MCTS" and not isinstance(self.mcts_engine, ParallelMCTS):
+            # Pool workers can't be interrupted, so only the in-process engine ponders
+            self.start_ai_search(self.mcts_engine, ponder=True)
+
+    def on_ai_move_ready(self, generation, move):
+        # Ignore searches that were cancelled by a restart or closed window
+        if generation != self.ai_generation:
+            return
+        self.ai_cancel = None
+        if move is None:
+            # The search failed; play a quick rule-based move rather than stall the game
+            move = rules.hard_move(self.state)
+            if move is None:
+                return
+            self.record_ai_move("rules")
         else:
-            # Moves in any playable mini-game
-            for mg_row in range(3):
-                for mg_col in range(3):
-                    mini_game = self.mini_games[mg_row][mg_col]
-                    if mini_game.winner is None and not mini_game.is_full:
-                        for r in range(3):
-                            for c in range(3):
-                                if mini_game.squares[r][c].state is None:
-                                    moves.append((mg_row, mg_col, r, c))
-        
-        return moves
+            self.record_ai_move("search", self.ai_engine().stats())
+        self.play_ai_move(from_move(move))
+
+    def cancel_ai(self):
+        self.ai_generation += 1
+        if self.ai_cancel is not None:
+            self.ai_cancel.set()
+            self.ai_cancel = None
+
+    def get_available_moves(self):
+        # Engine moves are already in row-major order across the playable mini-games
+        return [from_move(move) for move in self.state.legal_moves()]
 
     def get_random_move(self):
-        moves = self.get_available_moves()
-        return random.choice(moves) if moves else None
+        move = rules.random_move(self.state)
+        return from_move(move) if move is not None else None
 
     def get_medium_move(self):
-        moves = self.get_available_moves()
-        if not moves:
-            return None
-        
-        # Try to win a mini-game
-        for move in moves:
-            mg_row, mg_col, sq_row, sq_col = move
-            mini_game = self.mini_games[mg_row][mg_col]
-            # Simulate move - save original state
-            original_state = mini_game.squares[sq_row][sq_col].state
-            mini_game.squares[sq_row][sq_col].state = self.ai_player
-            
-            # Manually check for win without calling check_winner()
-            would_win = self.check_mini_game_win(mini_game, self.ai_player)
-            
-            # Restore original state
-            mini_game.squares[sq_row][sq_col].state = original_state
-            
-            if would_win:
-                return move
-        
-        # Try to block human from winning a mini-game
-        for move in moves:
-            mg_row, mg_col, sq_row, sq_col = move
-            mini_game = self.mini_games[mg_row][mg_col]
-            # Simulate human move - save original state
-            original_state = mini_game.squares[sq_row][sq_col].state
-            mini_game.squares[sq_row][sq_col].state = self.human_player
-            
-            # Manually check for win without calling check_winner()
-            would_win = self.check_mini_game_win(mini_game, self.human_player)
-            
-            # Restore original state
-            mini_game.squares[sq_row][sq_col].state = original_state
-            
-            if would_win:
-                return move
-        
-        # Otherwise random
-        return random.choice(moves)
+        move = rules.medium_move(self.state)
+        return from_move(move) if move is not None else None
 
     def get_hard_move(self):
-        moves = self.get_available_moves()
-        if not moves:
-            return None
-        
-        # 1. Try to win the overall game
-        for move in moves:
-            if self._leads_to_overall_win(move, self.ai_player):
-                return move
-        
-        # 2. Block human from winning the overall game
-        for move in moves:
-            if self._leads_to_overall_win(move, self.human_player):
-                return move
-        
-        # 3. Win any mini-game to build position
-        for move in moves:
-            if self._wins_mini_game(move, self.ai_player):
-                return move
-        
-        # 4. Block human from winning any mini-game
-        for move in moves:
-            if self._wins_mini_game(move, self.human_player):
-                return move
-        
-        # 5. Create two-in-a-row on main board (threatening position)
-        for move in moves:
-            if self._creates_two_in_row_main(move, self.ai_player):
-                return move
-        
-        # 6. Block human's two-in-a-row on main board
-        for move in moves:
-            if self._creates_two_in_row_main(move, self.human_player):
-                return move
-        
-        # 7. AVOID sending opponent to won/full boards (gives them freedom)
-        constrained_moves = [m for m in moves if not self._sends_to_won_or_full_board(m)]
-        if constrained_moves:
-            moves = constrained_moves
-        
-        # 8. Prefer center positions (stronger strategic value)
-        center_moves = [m for m in moves if self._is_center_position(m)]
-        if center_moves:
-            return random.choice(center_moves)
-        
-        # 9. Fall back to random from remaining moves
-        return random.choice(moves)
+        # Endgames go to hard_engine on the AI thread instead
+        move = rules.hard_move(self.state, book=self.opening_book)
+        return from_move(move) if move is not None else None
 
-    def _leads_to_overall_win(self, move, player):
-        """Check if move wins the overall game"""
-        mg_row, mg_col, sq_row, sq_col = move
-        mini_game = self.mini_games[mg_row][mg_col]
-        
-        original_state = mini_game.squares[sq_row][sq_col].state
-        original_winner = mini_game.winner
-        
-        mini_game.squares[sq_row][sq_col].state = player
-        
-        if self.check_mini_game_win(mini_game, player):
-            mini_game.winner = player
-            wins = self.would_win_game(player)
-            mini_game.winner = original_winner
-        else:
-            wins = False
-        
-        mini_game.squares[sq_row][sq_col].state = original_state
-        return wins
-
-    def _wins_mini_game(self, move, player):
-        """Check if move wins a mini-game"""
-        mg_row, mg_col, sq_row, sq_col = move
-        mini_game = self.mini_games[mg_row][mg_col]
-        
-        original = mini_game.squares[sq_row][sq_col].state
-        mini_game.squares[sq_row][sq_col].state = player
-        wins = self.check_mini_game_win(mini_game, player)
-        mini_game.squares[sq_row][sq_col].state = original
-        
-        return wins
-
-    def _creates_two_in_row_main(self, move, player):
-        """Check if winning this mini-game creates two-in-a-row on main board"""
-        if not self._wins_mini_game(move, player):
-            return False
-        
-        mg_row, mg_col = move[0], move[1]
-        
-        # Check if this creates 2-in-a-row on main board
-        # Check row
-        row_count = sum(1 for c in range(3) if self.mini_games[mg_row][c].winner == player)
-        if row_count == 1:  # Would become 2
-            return True
-        
-        # Check column
-        col_count = sum(1 for r in range(3) if self.mini_games[r][mg_col].winner == player)
-        if col_count == 1:  # Would become 2
-            return True
-        
-        # Check diagonals
-        if mg_row == mg_col:  # Main diagonal
-            diag_count = sum(1 for i in range(3) if self.mini_games[i][i].winner == player)
-            if diag_count == 1:
-                return True
-        
-        if mg_row + mg_col == 2:  # Anti-diagonal
-            anti_diag_count = sum(1 for i in range(3) if self.mini_games[i][2-i].winner == player)
-            if anti_diag_count == 1:
-                return True
-        
-        return False
-
-    def _is_center_position(self, move):
-        """Check if move is in a strategic center position"""
-        mg_row, mg_col, sq_row, sq_col = move
-        
-        # Prefer center mini-board
-        if mg_row == 1 and mg_col == 1:
-            return True
-        
-        # Prefer center square in any mini-board
-        if sq_row == 1 and sq_col == 1:
-            return True
-        
-        return False
+    def get_book_move(self):
+        move = self.opening_book.lookup(self.state)
+        return from_move(move) if move is not None else None
 
-    def _sends_to_won_or_full_board(self, move):
-        """Check if move sends opponent to a won or full board (BAD - gives them freedom!)"""
-        sq_row, sq_col = move[2], move[3]
-        next_board = self.mini_games[sq_row][sq_col]
-        
-        # Return True if sending to won/full board (this is BAD for us)
-        return next_board.winner is not None or next_board.is_full
-    
     def check_mini_game_win(self, mini_game, player):
-        squares = mini_game.squares
-        
-        # Check rows
-        for i in range(3):
-            if (squares[i][0].state == player and
-                squares[i][1].state == player and
-                squares[i][2].state == player):
-                return True
-        
-        # Check columns
-        for i in range(3):
-            if (squares[0][i].state == player and
-                squares[1][i].state == player and
-                squares[2][i].state == player):
-                return True
-        
-        # Check diagonals
-        if (squares[0][0].state == player and
-            squares[1][1].state == player and
-            squares[2][2].state == player):
-            return True
-        
-        if (squares[0][2].state == player and
-            squares[1][1].state == player and
-            squares[2][0].state == player):
-            return True
-        
-        return False
+        mask = self.state.cells[SIDES[player]][mini_game.row * 3 + mini_game.col]
+        return WIN[mask]
 
     def would_win_game(self, player):
-        # Check rows
-        for i in range(3):
-            if (self.mini_games[i][0].winner == player and
-                self.mini_games[i][1].winner == player and
-                self.mini_games[i][2].winner == player):
-                return True
-        
-        # Check columns
-        for i in range(3):
-            if (self.mini_games[0][i].winner == player and
-                self.mini_games[1][i].winner == player and
-                self.mini_games[2][i].winner == player):
-                return True
-        
-        # Check diagonals
-        if (self.mini_games[0][0].winner == player and
-            self.mini_games[1][1].winner == player and
-            self.mini_games[2][2].winner == player):
-            return True
-        
-        if (self.mini_games[0][2].winner == player and
-            self.mini_games[1][1].winner == player and
-            self.mini_games[2][0].winner == player):
-            return True
-        
-        return False
+        return WIN[self.state.macro[SIDES[player]]]
 
     def update_mini_game_highlights(self):
         for r in range(3):
@@ -450,35 +332,11 @@ class Board(QWidget):
         self.setStyleSheet(f"border-color: {colour};")
 
     def check_overall_winner(self):
-        winner = None
-        
-        # Check rows and columns
-        for i in range(3):
-            if (self.mini_games[i][0].winner is not None and
-                self.mini_games[i][0].winner == self.mini_games[i][1].winner == self.mini_games[i][2].winner):
-                winner = self.mini_games[i][0].winner
-                break
-            if (self.mini_games[0][i].winner is not None and
-                self.mini_games[0][i].winner == self.mini_games[1][i].winner == self.mini_games[2][i].winner):
-                winner = self.mini_games[0][i].winner
-                break
-
-        # Check diagonals
-        if winner is None:
-            if (self.mini_games[0][0].winner is not None and
-                self.mini_games[0][0].winner == self.mini_games[1][1].winner == self.mini_games[2][2].winner):
-                winner = self.mini_games[0][0].winner
-            elif (self.mini_games[0][2].winner is not None and
-                self.mini_games[0][2].winner == self.mini_games[1][1].winner == self.mini_games[2][0].winner):
-                winner = self.mini_games[0][2].winner
-
-        # Check for draw
-        if winner is None:
-            if all(self.mini_games[r][c].winner is not None or self.mini_games[r][c].is_full
-                   for r in range(3) for c in range(3)):
-                winner = "Draw"
+        # The engine tracks mini-game and overall wins (and draws) as moves are made
+        winner = self.state.winner()
 
         if winner:
+            self.cancel_ai()  # Stop any pondering
             self.game_over.emit()  # Emit signal to stop timer
             self.display_winner(winner)
             return True
@@ -504,7 +362,9 @@ class Board(QWidget):
         time_bonus = max(0, self.time_cap - int(self.time_taken)) 
 
         if winner == "X":
-            if self.difficulty == "Hard":
+            if self.difficulty in ("Expert", "MCTS"):
+                self.score = 1100 + time_bonus
+            elif self.difficulty == "Hard":
                 self.score = 900 + time_bonus
             elif self.difficulty == "Medium":
                 self.score = 700 + time_bonus
@@ -516,8 +376,10 @@ class Board(QWidget):
         dialog.exec()
 
     def reset_game(self):
-        self.current_player = "X"
-        self.active_mini_game = None
+        self.cancel_ai()
+        self.state = GameState()
+        self.transposition_table.clear()
+        self.mcts_engine.reset()
         self.start_time = None  # Reset timer
         self.time_taken = 0
         self.score = 0
@@ -538,5 +400,14 @@ class Board(QWidget):
         # Emit signal to restart timer
         self.turn_changed.emit()
                 
+    def shutdown(self):
+        self.closed = True
+        self.cancel_ai()
+        self.ai_pool.waitForDone(2000)
+
+        # Stop MCTS worker processes; they otherwise live for the whole game
+        if isinstance(self.mcts_engine, ParallelMCTS):
+            self.mcts_engine.shutdown()
+
     def sizeHint(self):
         return QSize(600, 600)
\ No newline at end of file
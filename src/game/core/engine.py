@@ -0,0 +1,196 @@
+"""Headless game state for Super Tic Tac Toe.
+
+The engine knows nothing about Qt. Each mini-board is stored as two 9-bit
+masks (one per player), won mini-boards are tracked on a 9-bit macro mask,
+and moves are plain integers ``board * 9 + cell`` where both ``board`` and
+``cell`` count row-major from the top-left.
+"""
+
+import random
+from .tables import WIN, CELLS, TRANSFORMS
+
+X = 0
+O = 1
+PLAYERS = ("X", "O")
+SIDES = {"X": X, "O": O}
+
+FULL = 0x1FF  # All nine cells / boards
+ANY_BOARD = -1  # No forced mini-board, play anywhere that's open
+
+# Zobrist keys: one per (side, cell), one per active board (index 0 is ANY_BOARD)
+# and one for O to move. Fixed seed so hashes are stable across runs and processes.
+_zobrist_rng = random.Random(0x5EED)
+ZOBRIST_CELLS = tuple(tuple(_zobrist_rng.getrandbits(64) for _ in range(81)) for _ in range(2))
+ZOBRIST_ACTIVE = tuple(_zobrist_rng.getrandbits(64) for _ in range(10))
+ZOBRIST_SIDE = _zobrist_rng.getrandbits(64)
+
+
+def _image(t, move):
+    board, cell = divmod(move, 9)
+    return TRANSFORMS[t][board] * 9 + TRANSFORMS[t][cell]
+
+
+def _pack(keys):
+    return sum(key << 64 * t for t, key in enumerate(keys))
+
+
+# The same keys seen through each of the 8 board symmetries, packed 64 bits per
+# symmetry into one int so a single XOR updates all eight hashes. Bits 64t..64t+63
+# of GameState.symmetry are the hash the position would have after transform t,
+# so the lowest 64 bits always equal GameState.hash.
+SYMMETRY_CELLS = tuple(
+    tuple(_pack(ZOBRIST_CELLS[side][_image(t, move)] for t in range(8)) for move in range(81))
+    for side in range(2)
+)
+SYMMETRY_ACTIVE = tuple(
+    _pack(ZOBRIST_ACTIVE[(TRANSFORMS[t][board] if board != ANY_BOARD else ANY_BOARD) + 1] for t in range(8))
+    for board in range(-1, 9)
+)
+SYMMETRY_SIDE = _pack([ZOBRIST_SIDE] * 8)
+
+# BOARD_MOVES[board][empty mask] -> the move indices of those empty cells, row-major.
+# Shared tuples, so listing the moves of a forced board allocates nothing.
+BOARD_MOVES = tuple(
+    tuple(tuple(board * 9 + cell for cell in CELLS[mask]) for mask in range(512))
+    for board in range(9)
+)
+
+
+def to_move(mg_row, mg_col, sq_row, sq_col):
+    """Convert a (mini-game row, col, square row, col) tuple to a move index"""
+    return (mg_row * 3 + mg_col) * 9 + sq_row * 3 + sq_col
+
+
+def from_move(move):
+    """Convert a move index back to a (mini-game row, col, square row, col) tuple"""
+    board, cell = divmod(move, 9)
+    return board // 3, board % 3, cell // 3, cell % 3
+
+
+class GameState:
+    __slots__ = ("cells", "empty", "macro", "closed", "active", "side", "result", "hash", "symmetry", "history")
+
+    def __init__(self):
+        self.cells = [[0] * 9, [0] * 9]  # Per side, per mini-board occupancy masks
+        self.empty = [FULL] * 9  # Per mini-board empty cells, kept in step with cells
+        self.macro = [0, 0]  # Per side, mask of mini-boards won
+        self.closed = 0  # Mini-boards that are won or full
+        self.active = ANY_BOARD
+        self.side = X  # Side to move
+        self.result = None  # None, "X", "O" or "Draw"
+        self.hash = ZOBRIST_ACTIVE[ANY_BOARD + 1]  # Updated incrementally by every move
+        self.symmetry = SYMMETRY_ACTIVE[ANY_BOARD + 1]  # All 8 symmetric hashes, see SYMMETRY_CELLS
+        self.history = []
+
+    @property
+    def current_player(self):
+        return PLAYERS[self.side]
+
+    def copy(self):
+        state = GameState.__new__(GameState)
+        state.cells = [self.cells[X][:], self.cells[O][:]]
+        state.empty = self.empty[:]
+        state.macro = self.macro[:]
+        state.closed = self.closed
+        state.active = self.active
+        state.side = self.side
+        state.result = self.result
+        state.hash = self.hash
+        state.symmetry = self.symmetry
+        state.history = self.history[:]
+        return state
+
+    def occupied(self, board):
+        return FULL ^ self.empty[board]
+
+    def is_legal(self, move):
+        if self.result is not None or not 0 <= move < 81:
+            return False
+
+        board, cell = divmod(move, 9)
+        if self.active != ANY_BOARD and board != self.active:
+            return False
+        if self.closed >> board & 1:
+            return False
+
+        return bool(self.empty[board] >> cell & 1)
+
+    def legal_moves(self):
+        """Legal move indices in row-major order, as a tuple that must not be modified"""
+        if self.result is not None:
+            return ()
+
+        if self.active != ANY_BOARD:
+            return BOARD_MOVES[self.active][self.empty[self.active]]
+
+        moves = ()
+        empty = self.empty
+        for board in CELLS[FULL & ~self.closed]:
+            moves += BOARD_MOVES[board][empty[board]]
+        return moves
+
+    def make_move(self, move):
+        """Place the side to move's mark. The move is assumed to be legal."""
+        board, cell = divmod(move, 9)
+        side = self.side
+        self.history.append((move, self.active, self.closed, self.result, side, self.hash, self.symmetry))
+
+        mask = self.cells[side][board] | (1 << cell)
+        self.cells[side][board] = mask
+        empty = self.empty[board] & ~(1 << cell)
+        self.empty[board] = empty
+        bit = 1 << board
+
+        if WIN[mask]:
+            self.macro[side] |= bit
+            self.closed |= bit
+            if WIN[self.macro[side]]:
+                self.result = PLAYERS[side]
+        elif not empty:
+            self.closed |= bit
+
+        if self.result is None and self.closed == FULL:
+            self.result = "Draw"
+
+        # The cell played decides where the opponent goes next
+        active = ANY_BOARD if self.closed >> cell & 1 else cell
+        self.hash ^= (
+            ZOBRIST_CELLS[side][move]
+            ^ ZOBRIST_ACTIVE[self.active + 1]
+            ^ ZOBRIST_ACTIVE[active + 1]
+            ^ ZOBRIST_SIDE
+        )
+        self.symmetry ^= (
+            SYMMETRY_CELLS[side][move]
+            ^ SYMMETRY_ACTIVE[self.active + 1]
+            ^ SYMMETRY_ACTIVE[active + 1]
+            ^ SYMMETRY_SIDE
+        )
+        self.active = active
+        self.side = side ^ 1
+
+    def unmake_move(self):
+        move, self.active, self.closed, self.result, side, self.hash, self.symmetry = self.history.pop()
+        self.side = side
+
+        board, cell = divmod(move, 9)
+        self.cells[side][board] &= ~(1 << cell)
+        self.empty[board] |= 1 << cell
+        # The board was open before this move, so the mover cannot have owned it
+        self.macro[side] &= ~(1 << board)
+
+    def pass_turn(self):
+        """Hand the move to the other side without playing (e.g. when a turn times out)"""
+        self.side ^= 1
+        self.hash ^= ZOBRIST_SIDE
+        self.symmetry ^= SYMMETRY_SIDE
+
+    def winner(self):
+        return self.result
+
+    def mini_game_winner(self, board):
+        if self.macro[X] >> board & 1:
+            return "X"
+        if self.macro[O] >> board & 1:
+            return "O"
+        return None
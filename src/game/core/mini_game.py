@@ -75,42 +75,12 @@ class MiniGame(QFrame):
 
         super().resizeEvent(event)
 
-    def check_winner(self):
-        # Don't re-check if there's already a winner
-        if self.winner is not None:
-            return self.winner
-        
-        # Check rows and columns
-        for i in range(3):
-            if (self.squares[i][0].state == self.squares[i][1].state ==
-                self.squares[i][2].state) and self.squares[i][0].state is not None:
-                self.winner = self.squares[i][0].state
-                self.display_winner()
-                return self.winner
-            if (self.squares[0][i].state == self.squares[1][i].state ==
-                self.squares[2][i].state) and self.squares[0][i].state is not None:
-                self.winner = self.squares[0][i].state
-                self.display_winner()
-                return self.winner
-
-        # Check diagonals
-        if (self.squares[0][0].state == self.squares[1][1].state ==
-            self.squares[2][2].state) and self.squares[0][0].state is not None:
-            self.winner = self.squares[0][0].state
-            self.display_winner()
-            return self.winner
-
-        if (self.squares[0][2].state == self.squares[1][1].state ==
-            self.squares[2][0].state) and self.squares[0][2].state is not None:
-            self.winner = self.squares[0][2].state
+    def set_result(self, winner, is_full):
+        # The engine decides mini-game wins; this only shows them
+        if self.winner is None and winner is not None:
+            self.winner = winner
             self.display_winner()
-            return self.winner
-
-        # Check for draw
-        if all(self.squares[r][c].state is not None for r in range(3) for c in range(3)):
-            self.is_full = True
-
-        return None
+        self.is_full = is_full
     
     def display_winner(self):
         if self.winner is not None:
@@ -0,0 +1,99 @@
+"""The 8 dihedral symmetries of the board.
+
+Rotating or reflecting the whole board moves the mini-boards around the
+macro board and the cells inside every mini-board in the same way, and the
+result is an equivalent position. Caches keyed by position can store one
+entry per symmetry class: look up the canonical key, and store moves in the
+canonical frame by passing them through ``transform_move`` on the way in and
+``restore_move`` on the way out.
+
+The canonical form of a position is the image with the smallest Zobrist
+hash. GameState keeps the hashes of all 8 images up to date on every move,
+so finding it costs a few shifts rather than a rebuild of the board.
+"""
+
+from .engine import GameState, ANY_BOARD, X, O
+from .tables import TRANSFORMS, INVERSE, MASK_TRANSFORMS
+
+IDENTITY = 0
+
+_MASK64 = (1 << 64) - 1
+_SHIFTS = tuple((t, 64 * t) for t in range(1, 8))
+
+# MOVE_TRANSFORMS[t][move] -> the move after transform t
+MOVE_TRANSFORMS = tuple(
+    tuple(TRANSFORMS[t][move // 9] * 9 + TRANSFORMS[t][move % 9] for move in range(81))
+    for t in range(8)
+)
+
+
+def transform_move(move, transform):
+    """Map a move on the original board to the transformed board"""
+    return MOVE_TRANSFORMS[transform][move]
+
+
+def restore_move(move, transform):
+    """Map a move on the transformed board back to the original board"""
+    return MOVE_TRANSFORMS[INVERSE[transform]][move]
+
+
+def canonical_key(state):
+    """Return (key, transform): the smallest hash over the 8 images and the transform giving it"""
+    packed = state.symmetry
+    key, transform = packed & _MASK64, IDENTITY
+    for t, shift in _SHIFTS:
+        image = packed >> shift & _MASK64
+        if image < key:
+            key, transform = image, t
+    return key, transform
+
+
+def transform_state(state, transform):
+    """A new GameState that is ``state`` seen through ``transform`` (without move history)"""
+    if transform == IDENTITY:
+        image = state.copy()
+        image.history = []
+        return image
+
+    image = GameState()
+    perm, masks = TRANSFORMS[transform], MASK_TRANSFORMS[transform]
+    for side in (X, O):
+        for board in range(9):
+            image.cells[side][perm[board]] = masks[state.cells[side][board]]
+        image.macro[side] = masks[state.macro[side]]
+    for board in range(9):
+        image.empty[perm[board]] = masks[state.empty[board]]
+    image.closed = masks[state.closed]
+    image.active = ANY_BOARD if state.active == ANY_BOARD else perm[state.active]
+    image.side = state.side
+    image.result = state.result
+    image.symmetry = _permute_hashes(state.symmetry, transform)
+    image.hash = image.symmetry & _MASK64
+    return image
+
+
+def canonicalize(state):
+    """Return (canonical_state, transform) with canonical_state = transform_state(state, transform)"""
+    _, transform = canonical_key(state)
+    return transform_state(state, transform), transform
+
+
+def _permute_hashes(packed, transform):
+    # Image u of the transformed position is image (u after transform) of the original
+    hashes = [packed >> 64 * t & _MASK64 for t in range(8)]
+    result = 0
+    for u in range(8):
+        result |= hashes[_COMPOSE[u][transform]] << 64 * u
+    return result
+
+
+# _COMPOSE[u][t] -> the single transform equal to applying t, then u
+_COMPOSE = tuple(
+    tuple(
+        next(v for v in range(8) if all(
+            TRANSFORMS[v][cell] == TRANSFORMS[u][TRANSFORMS[t][cell]] for cell in range(9)
+        ))
+        for t in range(8)
+    )
+    for u in range(8)
+)
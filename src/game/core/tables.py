@@ -0,0 +1,64 @@
+"""Precomputed lookup tables for 3x3 boards.
+
+Every table is indexed by a 9-bit occupancy mask (bit ``row * 3 + col``) and
+works the same for a single player's marks on a mini-board or a player's won
+mini-boards on the macro board.
+"""
+
+WIN_LINES = (
+    0b000000111, 0b000111000, 0b111000000,  # Rows
+    0b001001001, 0b010010010, 0b100100100,  # Columns
+    0b100010001, 0b001010100,               # Diagonals
+)
+
+
+def _has_line(mask):
+    return any(mask & line == line for line in WIN_LINES)
+
+
+# WIN[mask] -> True if the mask holds three in a row
+WIN = tuple(_has_line(mask) for mask in range(512))
+
+# COMPLETING[mask] -> 9-bit mask of the cells that would complete a line if added.
+# Cells already in the mask are never included; AND with the empty cells before use.
+COMPLETING = tuple(
+    sum(1 << cell for cell in range(9) if not mask >> cell & 1 and WIN[mask | 1 << cell])
+    for mask in range(512)
+)
+
+# CELLS[mask] -> the cells set in the mask, in ascending (row-major) order
+CELLS = tuple(tuple(cell for cell in range(9) if mask >> cell & 1) for mask in range(512))
+
+# The 8 symmetries of a 3x3 board (rotations and reflections) as cell permutations:
+# TRANSFORMS[t][cell] is where ``cell`` ends up. Index 0 is the identity.
+def _rotate(cell):
+    row, col = divmod(cell, 3)
+    return col * 3 + 2 - row
+
+
+def _mirror(cell):
+    row, col = divmod(cell, 3)
+    return row * 3 + 2 - col
+
+
+def _transform(t, cell):
+    if t >= 4:
+        cell = _mirror(cell)
+    for _ in range(t % 4):
+        cell = _rotate(cell)
+    return cell
+
+
+TRANSFORMS = tuple(tuple(_transform(t, cell) for cell in range(9)) for t in range(8))
+
+# INVERSE[t] -> the transform that undoes t
+INVERSE = tuple(
+    next(u for u in range(8) if all(TRANSFORMS[u][TRANSFORMS[t][cell]] == cell for cell in range(9)))
+    for t in range(8)
+)
+
+# MASK_TRANSFORMS[t][mask] -> the mask with every cell moved by transform t
+MASK_TRANSFORMS = tuple(
+    tuple(sum(1 << TRANSFORMS[t][cell] for cell in CELLS[mask]) for mask in range(512))
+    for t in range(8)
+)
@@ -1,10 +1,62 @@
+import atexit
+import bisect
 import sqlite3
+import threading
 from pathlib import Path
 
-DB_PATH = Path("src\game\data\leaderboard.db")
+DB_PATH = Path(__file__).resolve().parent / "leaderboard.db"
+
+LEADERBOARD_SIZE = 10  # Rows shown by the leaderboard window
+# Rows to keep in a trigger-maintained top_scores table, or None to read the top rows off the
+# score index (as fast, and one less thing to maintain on every insert)
+TOP_SCORES_SIZE = None
+
+# Applied to every new connection
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",  # Commits append to a log instead of rewriting a rollback journal
+    "PRAGMA synchronous = NORMAL",  # With WAL, only checkpoints fsync; a crash can't corrupt the DB
+    "PRAGMA cache_size = -8000",  # 8 MB page cache
+    "PRAGMA temp_store = MEMORY",
+)
+
+# One connection per thread, opened on first use and kept until close_connections()
+_local = threading.local()
+_connections = []
+_lock = threading.Lock()
+_generation = 0  # Bumped by close_connections() so threads reopen
+
+# The top LEADERBOARD_SIZE rows as (-score, player_name, id), in leaderboard order. Loaded by
+# the first get_leaderboard() and then kept current by add_scores(), so reads need no query
+_top_cache = None
+_cache_writes = 0  # Bumped by every write, so a read racing one doesn't cache stale rows
+_cache_lock = threading.Lock()
 
 def get_connection():
-    return sqlite3.connect(DB_PATH)
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.generation != _generation:
+        # Closed from the GUI thread at exit, so not tied to the opening thread
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        _local.conn = conn
+        _local.generation = _generation
+        with _lock:
+            _connections.append(conn)
+    return conn
+
+def close_connections():
+    global _generation
+    _reset_cache(None)  # DB_PATH may point somewhere else next time
+    with _lock:
+        _generation += 1
+        for conn in _connections:
+            conn.close()  # The last close checkpoints the WAL back into the database file
+        _connections.clear()
+
+atexit.register(close_connections)
+
+def normalize_username(username):
+    return username.strip().lower()
 
 def initialize_database():
     conn = get_connection()
@@ -18,55 +70,189 @@ def initialize_database():
         )
     ''')
 
+    # One row per username; the unique constraint indexes the normalized name
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS players (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            normalized_name TEXT NOT NULL UNIQUE
+        )
+    ''')
+
+    version = cursor.execute("PRAGMA user_version").fetchone()[0]
+    if version < 1:
+        # Register everyone who already has a score
+        names = cursor.execute("SELECT DISTINCT player_name FROM leaderboard").fetchall()
+        cursor.executemany('''
+            INSERT OR IGNORE INTO players (name, normalized_name)
+            VALUES (?, ?)
+        ''', ((name, normalize_username(name)) for name, in names))
+        cursor.execute("PRAGMA user_version = 1")
+
+    # Covers get_leaderboard, so the top rows are read straight off the index
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS leaderboard_score
+        ON leaderboard (score DESC, player_name)
+    ''')
+
+    _create_top_scores(cursor, TOP_SCORES_SIZE)
+
     conn.commit()
-    conn.close()
+
+def _create_top_scores(cursor, size):
+    # Rebuilt on every start, so a changed size (or turning it off) takes effect
+    cursor.execute('DROP TRIGGER IF EXISTS top_scores_insert')
+    cursor.execute('DROP TRIGGER IF EXISTS top_scores_delete')
+    cursor.execute('DROP TABLE IF EXISTS top_scores')
+    if not size:
+        return
+
+    cursor.execute('''
+        CREATE TABLE top_scores (
+            id INTEGER PRIMARY KEY,
+            player_name TEXT NOT NULL,
+            score INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute(f'''
+        INSERT INTO top_scores (id, player_name, score)
+        SELECT id, player_name, score
+        FROM leaderboard
+        ORDER BY score DESC, player_name, id
+        LIMIT {int(size)}
+    ''')
+
+    # A new score only touches the table if it could make the top N
+    cursor.execute(f'''
+        CREATE TRIGGER top_scores_insert AFTER INSERT ON leaderboard
+        WHEN (SELECT COUNT(*) FROM top_scores) < {int(size)}
+            OR NEW.score >= (SELECT MIN(score) FROM top_scores)
+        BEGIN
+            INSERT INTO top_scores (id, player_name, score)
+            VALUES (NEW.id, NEW.player_name, NEW.score);
+            DELETE FROM top_scores WHERE id NOT IN (
+                SELECT id FROM top_scores ORDER BY score DESC, player_name, id LIMIT {int(size)}
+            );
+        END
+    ''')
+    # Deleting a top score pulls the next best one up from the index
+    cursor.execute(f'''
+        CREATE TRIGGER top_scores_delete AFTER DELETE ON leaderboard
+        WHEN OLD.id IN (SELECT id FROM top_scores)
+        BEGIN
+            DELETE FROM top_scores WHERE id = OLD.id;
+            INSERT OR IGNORE INTO top_scores (id, player_name, score)
+            SELECT id, player_name, score
+            FROM leaderboard
+            ORDER BY score DESC, player_name, id
+            LIMIT {int(size)};
+        END
+    ''')
 
 def add_score(username, score):
+    add_scores([(username, score)])
+
+def add_scores(scores):
+    # Any number of (username, score) pairs in one transaction
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute('''
-        INSERT INTO leaderboard (player_name, score)
-        VALUES (?, ?)
-    ''', (username, score))
+    try:
+        ids = []
+        for username, score in scores:
+            cursor.execute('''
+                INSERT INTO leaderboard (player_name, score)
+                VALUES (?, ?)
+            ''', (username, score))
+            ids.append(cursor.lastrowid)
+        cursor.executemany('''
+            INSERT OR IGNORE INTO players (name, normalized_name)
+            VALUES (?, ?)
+        ''', [(username, normalize_username(username)) for username, _ in scores])
+    except sqlite3.Error:
+        conn.rollback()  # All or nothing, and don't leave the connection mid-transaction
+        raise
 
     conn.commit()
-    conn.close()
+    _cache_scores(zip(ids, scores))
+
+def _cache_scores(rows):
+    global _cache_writes
+    with _cache_lock:
+        _cache_writes += 1
+        if _top_cache is None:
+            return  # Nothing cached yet; the next read loads the new rows too
+        for row_id, (username, score) in rows:
+            entry = (-score, username, row_id)
+            if len(_top_cache) < LEADERBOARD_SIZE or entry < _top_cache[-1]:
+                bisect.insort(_top_cache, entry)
+                del _top_cache[LEADERBOARD_SIZE:]
+
+def _reset_cache(rows):
+    global _top_cache, _cache_writes
+    with _cache_lock:
+        _top_cache = rows
+        _cache_writes += 1
+
+def get_leaderboard(limit=LEADERBOARD_SIZE):
+    global _top_cache
+    with _cache_lock:
+        if _top_cache is not None and limit <= LEADERBOARD_SIZE:
+            return [(name, -negative_score) for negative_score, name, _ in _top_cache[:limit]]
+        writes = _cache_writes
 
-def get_leaderboard():
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute('''
-        SELECT player_name, score
-        FROM leaderboard
-        ORDER BY score DESC
-        LIMIT 10
-    ''')
+    # Either way this reads at most ``count`` rows, however many scores there are; top_scores
+    # only serves it when it holds every row the cache needs
+    count = max(limit, LEADERBOARD_SIZE)
+    table = "top_scores" if TOP_SCORES_SIZE and TOP_SCORES_SIZE >= count else "leaderboard"
+    cursor.execute(f'''
+        SELECT id, player_name, score
+        FROM {table}
+        ORDER BY score DESC, player_name, id
+        LIMIT ?
+    ''', (count,))
+    rows = cursor.fetchall()
 
-    results = cursor.fetchall()
-    conn.close()
-    return results
+    with _cache_lock:
+        if writes == _cache_writes:
+            _top_cache = [(-score, name, row_id) for row_id, name, score in rows[:LEADERBOARD_SIZE]]
+    return [(name, score) for _, name, score in rows[:limit]]
 
 def get_usernames() -> set[str]:
     conn = get_connection()
     cursor = conn.cursor()
 
     cursor.execute("""
-        SELECT player_name
-        FROM leaderboard
+        SELECT name
+        FROM players
     """)
 
-    usernames = {row[0] for row in cursor.fetchall()}
-    conn.close()
-    return usernames
+    return {row[0] for row in cursor.fetchall()}
+
+def is_username_taken(username) -> bool:
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT 1
+        FROM players
+        WHERE normalized_name = ?
+    """, (normalize_username(username),))
+
+    return cursor.fetchone() is not None
 
 def clear_leaderboard():
     conn = get_connection()
     cursor = conn.cursor()
 
+    if TOP_SCORES_SIZE:
+        cursor.execute('DELETE FROM top_scores')  # First, so deleting scores doesn't refill it
     cursor.execute('DELETE FROM leaderboard')
+    cursor.execute('DELETE FROM players')
 
     conn.commit()
-    conn.close()
+    _reset_cache([])
 
@@ -0,0 +1,51 @@
+import sqlite3
+import struct
+from pathlib import Path
+from game.core.symmetry import canonicalize
+
+CACHE_PATH = Path(__file__).resolve().parent / "endgame.db"
+
+_KEY = struct.Struct("<18HbB")
+
+
+def position_key(state):
+    """Exact encoding of the position's symmetry class, plus the transform to its canonical form"""
+    # Both players' cells, the active board and the side to move, all after canonicalizing
+    canonical, transform = canonicalize(state)
+    return _KEY.pack(*canonical.cells[0], *canonical.cells[1], canonical.active, canonical.side), transform
+
+
+class EndgameCache:
+    """Solved endgame positions kept on disk between runs, one row per symmetry class"""
+
+    def __init__(self, path=CACHE_PATH):
+        # Used from the GUI thread and the AI thread, but never by both at once
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS endgame (
+                position BLOB PRIMARY KEY,
+                value INTEGER NOT NULL,
+                move INTEGER NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        self.conn.commit()
+
+    def get(self, key):
+        """Return (value, move) for a solved position, or None"""
+        return self.conn.execute(
+            'SELECT value, move FROM endgame WHERE position = ?', (key,)
+        ).fetchone()
+
+    def put(self, key, value, move):
+        # ``move`` is in the canonical frame, like the key
+        self.conn.execute(
+            'INSERT OR REPLACE INTO endgame (position, value, move) VALUES (?, ?, ?)',
+            (key, value, move)
+        )
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM endgame').fetchone()[0]
+
+    def close(self):
+        self.conn.close()
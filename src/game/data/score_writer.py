@@ -0,0 +1,82 @@
+"""Background writer for leaderboard scores.
+
+The game-over dialog hands its score to ``submit`` and carries on; a
+dedicated thread with its own SQLite connection writes whatever has queued
+up in a single transaction, reports each saved batch with a Qt signal and
+logs a batch that cannot be written to stderr. A locked database or slow
+disk therefore never holds up the GUI. ``shutdown`` (connected to the
+application quitting, and run at exit) waits for the queue to drain, so a
+score from a game that has just ended is not lost.
+"""
+
+import atexit
+import queue
+import sqlite3
+import sys
+import threading
+from PyQt6.QtCore import QObject, pyqtSignal
+from . import database
+
+_STOP = object()
+
+_default_writer = None
+
+
+class ScoreWriter(QObject):
+    scores_saved = pyqtSignal(list)  # The (username, score) pairs committed together
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="score-writer", daemon=True)
+                self.thread.start()
+
+    def submit(self, username, score):
+        """Queue a score to be written; returns at once"""
+        self.start()
+        self.queue.put((username, score))
+
+    def shutdown(self):
+        """Write what is queued, then stop the thread"""
+        with self.lock:
+            thread, self.thread = self.thread, None
+        if thread is not None:
+            self.queue.put(_STOP)
+            thread.join()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            # Everything else already waiting goes into the same transaction
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = _STOP in batch
+            scores = [item for item in batch if item is not _STOP]
+            if scores:
+                try:
+                    database.add_scores(scores)
+                except sqlite3.Error as error:
+                    print(f"Could not save {len(scores)} score(s): {error}", file=sys.stderr)
+                else:
+                    self.scores_saved.emit(scores)
+            if stop:
+                return
+
+
+def get_score_writer():
+    """One writer per process, shut down (after writing its queue) at exit"""
+    global _default_writer
+    if _default_writer is None:
+        _default_writer = ScoreWriter()
+        atexit.register(_default_writer.shutdown)
+    return _default_writer
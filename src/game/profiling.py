@@ -0,0 +1,162 @@
+"""Opt-in timing spans and cProfile around the move, AI and paint pipeline.
+
+Nothing here runs unless ``install`` is called (``main.py`` does so for
+``--profile`` or ``STTT_PROFILE=1``), so a normal game pays nothing for it.
+Once installed, the methods in TARGETS are replaced by wrappers that time
+every call as a span: Board.make_move, the hover refresh that restyles all
+81 squares after each move, BoardSquare.paintEvent, and the AI move entry
+points, including the search on the AI thread.
+
+With ``moves`` set (``--profile-moves N`` or ``STTT_PROFILE_MOVES=N``),
+cProfile also runs on the GUI thread from the first move until N moves have
+been made, so app start-up is left out, and its stats are written to
+``profile.prof`` for pstats or snakeviz. On exit the spans are written to ``trace.json`` in the Chrome
+trace format (open it in chrome://tracing or https://ui.perfetto.dev) and a
+per-span summary is printed.
+"""
+
+import atexit
+import cProfile
+import functools
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+ENABLE_ENV = "STTT_PROFILE"
+MOVES_ENV = "STTT_PROFILE_MOVES"
+DIR_ENV = "STTT_PROFILE_DIR"
+
+# (module, class, method) wrapped in timing spans
+TARGETS = (
+    ("game.core.board", "Board", "make_move"),
+    ("game.core.board", "Board", "update_playable_mini_games"),
+    ("game.core.board", "Board", "ai_make_move"),
+    ("game.core.board", "Board", "on_ai_move_ready"),
+    ("game.core.mini_game", "MiniGame", "refresh_hovers"),
+    ("game.core.board_square", "BoardSquare", "paintEvent"),
+    ("game.ai.worker", "AIWorker", "run"),
+)
+
+_profiler = None
+
+
+class Profiler:
+    def __init__(self, output_dir="profiles", moves=0, max_spans=500_000):
+        self.output_dir = output_dir
+        self.moves = moves  # Moves to run cProfile for; 0 for spans only
+        self.spans = deque(maxlen=max_spans)  # (name, start, duration, thread id), in seconds
+        self.origin = time.perf_counter()
+        self.profile = None
+        self.moves_seen = 0
+
+    def span(self, name, function):
+        """Wrap a function so every call is recorded as a span"""
+        spans = self.spans
+        clock = time.perf_counter
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                spans.append((name, start, clock() - start, threading.get_ident()))
+
+        return timed
+
+    def install(self):
+        for module_name, class_name, method in TARGETS:
+            cls = getattr(importlib.import_module(module_name), class_name)
+            setattr(cls, method, self.span(f"{class_name}.{method}", cls.__dict__[method]))
+
+        if self.moves:
+            from game.core.board import Board
+            make_move = Board.make_move
+
+            def counted(board, *args, **kwargs):
+                if self.moves_seen == 0:
+                    self.profile = cProfile.Profile()
+                    self.profile.enable()
+                result = make_move(board, *args, **kwargs)
+                self.moves_seen += 1
+                if self.moves_seen == self.moves:
+                    self.stop_profile()
+                return result
+
+            Board.make_move = functools.wraps(make_move)(counted)
+
+        atexit.register(self.finish)
+
+    def stop_profile(self):
+        """Stop cProfile and write its stats, if it is running"""
+        if self.profile is None:
+            return None
+        self.profile.disable()
+        path = self._path("profile.prof")
+        self.profile.dump_stats(path)
+        self.profile = None
+        return path
+
+    def summary(self):
+        """{span name: {"calls", "total_ms", "mean_ms", "max_ms"}}"""
+        totals = {}
+        for name, _, duration, _ in list(self.spans):
+            calls, total, longest = totals.get(name, (0, 0.0, 0.0))
+            totals[name] = (calls + 1, total + duration, max(longest, duration))
+        return {
+            name: {"calls": calls, "total_ms": total * 1000, "mean_ms": total / calls * 1000,
+                   "max_ms": longest * 1000}
+            for name, (calls, total, longest) in sorted(totals.items(), key=lambda item: -item[1][1])
+        }
+
+    def write_trace(self):
+        pid = os.getpid()
+        spans = list(self.spans)
+        main_thread = threading.main_thread().ident
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+             "args": {"name": "GUI" if tid == main_thread else "AI"}}
+            for tid in {span[3] for span in spans}
+        ]
+        events += [
+            {"name": name, "cat": name.split(".")[0], "ph": "X", "pid": pid, "tid": tid,
+             "ts": (start - self.origin) * 1e6, "dur": duration * 1e6}
+            for name, start, duration, tid in spans
+        ]
+        path = self._path("trace.json")
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return path
+
+    def finish(self):
+        paths = [self.stop_profile(), self.write_trace()]
+        print(f"{'span':<36} {'calls':>8} {'total ms':>10} {'mean ms':>9} {'max ms':>9}", file=sys.stderr)
+        for name, row in self.summary().items():
+            print(f"{name:<36} {row['calls']:>8} {row['total_ms']:>10.1f} {row['mean_ms']:>9.3f} "
+                  f"{row['max_ms']:>9.1f}", file=sys.stderr)
+        print("Profile written to " + ", ".join(path for path in paths if path), file=sys.stderr)
+
+    def _path(self, name):
+        os.makedirs(self.output_dir, exist_ok=True)
+        return os.path.join(self.output_dir, name)
+
+
+def install(output_dir=None, moves=None):
+    """Start profiling the GUI for the rest of the process; returns the Profiler"""
+    global _profiler
+    if _profiler is None:
+        if output_dir is None:
+            output_dir = os.environ.get(DIR_ENV, "profiles")
+        if moves is None:
+            moves = int(os.environ.get(MOVES_ENV, "0"))
+        _profiler = Profiler(output_dir, moves)
+        _profiler.install()
+    return _profiler
+
+
+def enabled_by_environment():
+    return os.environ.get(ENABLE_ENV, "") not in ("", "0") or bool(os.environ.get(MOVES_ENV))
@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QFrame
 from PyQt6.QtCore import Qt
-from game.data.database import add_score
+from game.data.score_writer import get_score_writer
 
 class GameResultDialog(QDialog):
     def __init__(self, winner, score, username=None, parent=None):
@@ -38,7 +38,8 @@ class GameResultDialog(QDialog):
         
         if score > 0:
             # Score label
-            add_score(username, score)  # Assuming single player for simplicity
+            # Written on the score writer thread so a slow disk can't delay the dialog
+            get_score_writer().submit(username, score)  # Assuming single player for simplicity
             score_label = QLabel(f"Score: {score}")
             score_label.setObjectName("gameScoreLabel")
             score_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
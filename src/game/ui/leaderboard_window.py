@@ -4,12 +4,44 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont, QColor, QPalette
 from game.data import database
+from game.data.score_writer import get_score_writer
+
+_shared_window = None
+
+# Medal colours for the top 3 ranks
+RANK_COLOURS = {1: "#FFD700", 2: "#C0C0C0", 3: "#CD7F32"}
+
+
+def get_leaderboard_window(menu=None):
+    """The one leaderboard window, created on first use and reused on every visit after"""
+    global _shared_window
+    if _shared_window is None:
+        _shared_window = LeaderboardWindow(menu)
+        # A bound method, so the writer thread's signal is queued to the GUI thread
+        get_score_writer().scores_saved.connect(_shared_window.on_scores_saved)
+    else:
+        _shared_window.menu = menu
+    return _shared_window
 
 
 class LeaderboardWindow(QWidget):
-    def __init__(self):
+    def __init__(self, menu=None):
         super().__init__()
         self.database = database
+        self.menu = menu  # Shown again by back_to_menu
+        self.rows = None  # The (name, score) rows on screen; [] for the empty message
+
+        # Built once and shared by every cell that uses them
+        self.rank_font = QFont()
+        self.rank_font.setBold(True)
+        self.name_font = QFont()
+        self.name_font.setPointSize(11)
+        self.top_name_font = QFont(self.name_font)
+        self.top_name_font.setBold(True)
+        self.score_font = QFont()
+        self.score_font.setPointSize(12)
+        self.score_font.setBold(True)
+        self.score_colour = QColor("#69c8ff")
 
         self.init_ui()
         self.load_leaderboard()
@@ -87,16 +119,31 @@ class LeaderboardWindow(QWidget):
         
         self.setLayout(main_layout)
         
+    def showEvent(self, event):
+        # Served from the database module's cache, so re-showing costs no query
+        super().showEvent(event)
+        self.load_leaderboard()
+
+    def on_scores_saved(self, scores):
+        # A hidden window catches up in showEvent instead
+        if self.isVisible():
+            self.load_leaderboard()
+
     def load_leaderboard(self):
         try:
             # Get leaderboard data
             leaderboard_data = self.database.get_leaderboard()
-            
-            # Clear existing rows
-            self.table.setRowCount(0)
+            if leaderboard_data == self.rows:
+                return  # Nothing changed since the last load
+
+            if not leaderboard_data or not self.rows:
+                # Switching to or from the empty message: start from a clean table
+                self.table.setRowCount(0)
+                self.table.clearSpans()
             
             # Check if leaderboard is empty
             if not leaderboard_data:
+                self.rows = []
                 # Show empty state message
                 self.table.setRowCount(1)
                 empty_message = QTableWidgetItem("No scores yet - be the first to play!")
@@ -110,53 +157,55 @@ class LeaderboardWindow(QWidget):
                 self.table.setRowHeight(0, 100)
                 return
             
-            # Populate table
-            for rank, (name, score) in enumerate(leaderboard_data, start=1):
-                row_position = self.table.rowCount()
-                self.table.insertRow(row_position)
-                
-                # Rank column
-                rank_item = QTableWidgetItem(f"#{rank}")
-                rank_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                rank_font = QFont()
-                rank_font.setBold(True)
-                rank_item.setFont(rank_font)
-                
-                # Special styling for top 3
-                if rank == 1:
-                    rank_item.setForeground(QColor("#FFD700"))  # Gold
-                elif rank == 2:
-                    rank_item.setForeground(QColor("#C0C0C0"))  # Silver
-                elif rank == 3:
-                    rank_item.setForeground(QColor("#CD7F32"))  # Bronze
-                
-                self.table.setItem(row_position, 0, rank_item)
-                
-                # Name column
-                name_item = QTableWidgetItem(name)
-                name_item.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-                name_font = QFont()
-                name_font.setPointSize(11)
-                if rank <= 3:
-                    name_font.setBold(True)
-                name_item.setFont(name_font)
-                self.table.setItem(row_position, 1, name_item)
-                
-                # Score column
-                score_item = QTableWidgetItem(f"{score:,}")
-                score_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                score_font = QFont()
-                score_font.setPointSize(12)
-                score_font.setBold(True)
-                score_item.setFont(score_font)
-                score_item.setForeground(QColor("#69c8ff"))
-                self.table.setItem(row_position, 2, score_item)
+            # Populate table, touching only rows whose player or score changed
+            previous = self.rows or []
+            self.table.setRowCount(len(leaderboard_data))
+            for row_position, (name, score) in enumerate(leaderboard_data):
+                if row_position < len(previous) and previous[row_position] == (name, score):
+                    continue
+
+                if self.table.item(row_position, 0) is None:
+                    self.create_row(row_position)
+                self.table.item(row_position, 1).setText(name)
+                self.table.item(row_position, 2).setText(f"{score:,}")
+
+            self.rows = leaderboard_data
                 
         except Exception as e:
             print(f"Error loading leaderboard: {e}")
 
+    def create_row(self, row_position):
+        rank = row_position + 1
+
+        # Rank column
+        rank_item = QTableWidgetItem(f"#{rank}")
+        rank_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        rank_item.setFont(self.rank_font)
+        
+        # Special styling for top 3
+        if rank in RANK_COLOURS:
+            rank_item.setForeground(QColor(RANK_COLOURS[rank]))  # Gold, silver, bronze
+        
+        self.table.setItem(row_position, 0, rank_item)
+        
+        # Name column
+        name_item = QTableWidgetItem()
+        name_item.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+        name_item.setFont(self.top_name_font if rank <= 3 else self.name_font)
+        self.table.setItem(row_position, 1, name_item)
+        
+        # Score column
+        score_item = QTableWidgetItem()
+        score_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        score_item.setFont(self.score_font)
+        score_item.setForeground(self.score_colour)
+        self.table.setItem(row_position, 2, score_item)
+
     def back_to_menu(self):
-        from .menu_window import MenuWindow
-        self.menu_window = MenuWindow()
-        self.menu_window.show()
+        if self.menu is not None:
+            self.menu.showFullScreen()  # The menu that opened us is only hidden
+        else:
+            from .menu_window import MenuWindow
+            self.menu = MenuWindow()
+            self.menu.show()
         self.close()
\ No newline at end of file
@@ -1,6 +1,8 @@
 from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFrame
 from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QShortcut, QKeySequence
 from ..core.board import Board
+from .telemetry_overlay import TelemetryOverlay
 
 class MainWindow(QMainWindow):
     def __init__(self, mode, difficulty, username=None):
@@ -70,6 +72,12 @@ class MainWindow(QMainWindow):
         controls.addWidget(back_btn)
         controls.addStretch()
         layout.addLayout(controls)
+
+        # AI move telemetry, drawn over the top-left corner; F3 shows and hides it
+        self.telemetry_overlay = TelemetryOverlay(self.board.telemetry, self.board.difficulty, central)
+        self.telemetry_overlay.move(10, 10)
+        self.board.ai_move_recorded.connect(self.telemetry_overlay.on_record)
+        QShortcut(QKeySequence("F3"), self, activated=self.telemetry_overlay.toggle)
         
         self.start_countdown()
     
@@ -85,6 +93,7 @@ class MainWindow(QMainWindow):
         self.timer_label.setText("4")
         self.update_timer_color()
         self.countdown_timer.start(1000)
+        self.board.start_pondering()  # AI thinks ahead during the human's countdown
     
     def update_timer(self):
         self.time_remaining -= 1
@@ -148,13 +157,21 @@ class MainWindow(QMainWindow):
     
     def restart_game(self):
         self.countdown_timer.stop()
-        self.board.reset_game()
+        self.board.reset_game()  # Also cancels any AI search in progress
         self.timer_subtitle.setText("Player X's Turn")
         self.start_countdown()
     
+    def closeEvent(self, event):
+        # Stop the countdown too, or it would go on skipping turns on the hidden board
+        if hasattr(self, 'countdown_timer'):
+            self.countdown_timer.stop()
+        self.board.shutdown()
+        super().closeEvent(event)
+    
     def back(self):
         if hasattr(self, 'countdown_timer'):
             self.countdown_timer.stop()
+        self.board.cancel_ai()
         from .menu_window import MenuWindow
         self.menu_window = MenuWindow()
         self.menu_window.show()
@@ -3,7 +3,7 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 from .main_window import MainWindow
 from .instructions_window import InstructionsWindow
-from game.data.database import get_usernames
+from game.data.database import is_username_taken
 
 
 class MenuWindow(QWidget):
@@ -49,7 +49,7 @@ class MenuWindow(QWidget):
         self.difficulty_selector.setObjectName("menuComboBox")
         self.difficulty_selector.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         self.difficulty_selector.setMinimumWidth(360)
-        self.difficulty_selector.addItems(["Easy (500+)", "Medium (700+)", "Hard (900+)"])
+        self.difficulty_selector.addItems(["Easy (500+)", "Medium (700+)", "Hard (900+)", "Expert (1100+)", "MCTS (1100+)"])
         layout.addWidget(self.difficulty_selector, alignment=Qt.AlignmentFlag.AlignCenter)
 
         # Buttons
@@ -112,6 +112,10 @@ class MenuWindow(QWidget):
             difficulty = "Easy"
         elif difficulty == "Medium (700+)":
             difficulty = "Medium"
+        elif difficulty == "Expert (1100+)":
+            difficulty = "Expert"
+        elif difficulty == "MCTS (1100+)":
+            difficulty = "MCTS"
         else:
             difficulty = "Hard"
 
@@ -131,14 +135,12 @@ class MenuWindow(QWidget):
         self.close()
 
     def show_leaderboard_window(self):
-        from .leaderboard_window import LeaderboardWindow
-        self.leaderboard_win = LeaderboardWindow()
+        from .leaderboard_window import get_leaderboard_window
+        self.leaderboard_win = get_leaderboard_window(menu=self)  # Reused across visits
         self.leaderboard_win.showFullScreen()
         self.close()
 
     def _prompt_username_required(self) -> str | None:
-        existing_usernames = get_usernames()
-        
         while True:
             # Create dialog instance
             dialog = QInputDialog(self)
@@ -167,13 +169,11 @@ class MenuWindow(QWidget):
             if not ok:
                 return None
 
-            existing_usernames = {u.lower() for u in get_usernames()}
-
             if not username:
                 QMessageBox.warning(self, "Invalid Username", "Username cannot be empty.")
                 continue
 
-            if username in existing_usernames:
+            if is_username_taken(username):
                 QMessageBox.warning(self, "Username Taken", "That username is already taken. Please choose another.")
                 continue
 
@@ -0,0 +1,92 @@
+from PyQt6.QtWidgets import QFrame
+from PyQt6.QtGui import QPainter, QColor, QFont
+from PyQt6.QtCore import Qt, QRectF
+from styling.colours import FONT, GRID, RED, BLUE
+from ..ai.telemetry import LATENCY_BUCKETS
+
+class TelemetryOverlay(QFrame):
+    """Latest AI move figures and a latency histogram, drawn over the window (toggle with F3)"""
+
+    def __init__(self, telemetry, difficulty=None, parent=None):
+        super().__init__(parent)
+        self.telemetry = telemetry
+        self.difficulty = difficulty  # Only this difficulty's moves are shown
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setFixedSize(270, 150)
+        self.hide()
+
+    def toggle(self):
+        self.setVisible(not self.isVisible())
+        if self.isVisible():
+            self.raise_()
+
+    def on_record(self, entry):
+        if self.isVisible():
+            self.update()
+
+    def summary_lines(self):
+        records = self.telemetry.snapshot(self.difficulty)
+        if not records:
+            return ["AI telemetry", "No AI moves yet"]
+
+        latest = records[-1]
+        figures = [f"{latest['wall_ms']:.0f} ms"]
+        if latest["nodes"] is not None:
+            unit = "playouts" if self.difficulty == "MCTS" else "nodes"
+            figures.append(f"{latest['nodes']:,} {unit}")
+        if latest["depth"]:
+            figures.append(f"depth {latest['depth']}")
+        if latest["cache_hit_rate"] is not None:
+            figures.append(f"hits {latest['cache_hit_rate']:.0%}")
+
+        p50, p95 = self.telemetry.percentiles(self.difficulty)
+        return [
+            f"{latest['difficulty']} - {latest['source']}",
+            "  ".join(figures),
+            f"p50 {p50:.0f} ms  p95 {p95:.0f} ms  ({len(records)} moves)",
+        ]
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+
+        background = QColor(FONT)
+        background.setAlpha(220)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(background)
+        painter.drawRoundedRect(QRectF(self.rect()), 8, 8)
+
+        font = QFont(painter.font())
+        font.setPixelSize(12)
+        painter.setFont(font)
+        painter.setPen(Qt.GlobalColor.white)
+        y = 18
+        for line in self.summary_lines():
+            painter.drawText(10, y, line)
+            y += 16
+
+        # Histogram: one bar per latency bucket, with the p50 and p95 buckets coloured
+        counts = self.telemetry.histogram(self.difficulty)
+        tallest = max(counts) or 1
+        p50, p95 = self.telemetry.percentiles(self.difficulty)
+        marked = {}
+        for value, colour in ((p95, RED), (p50, BLUE)):
+            if value is not None:
+                marked[next(i for i, edge in enumerate(LATENCY_BUCKETS) if value <= edge)] = colour
+
+        left, bottom, height = 10, self.height() - 18, 50
+        width = (self.width() - 2 * left) / len(counts)
+        for bucket, count in enumerate(counts):
+            bar = height * count / tallest
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(marked.get(bucket, GRID)))
+            painter.drawRect(QRectF(left + bucket * width + 1, bottom - bar, width - 2, bar))
+
+        font.setPixelSize(9)
+        painter.setFont(font)
+        painter.setPen(QColor(GRID))
+        # Each label marks the lower edge of the bucket it sits under
+        for bucket in (1, 4, 7, 10, 12):
+            edge = LATENCY_BUCKETS[bucket - 1]
+            label = f"{edge // 1000}s" if edge >= 1000 else f"{edge}ms"
+            painter.drawText(int(left + bucket * width), self.height() - 5, label)
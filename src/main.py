@@ -1,17 +1,34 @@
+import argparse
 import sys
 from PyQt6.QtWidgets import QApplication
 from game.ui.menu_window import MenuWindow
 from styling.colours import *
 from game.data import database
+from game.data.score_writer import get_score_writer
+from game import profiling
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Super Tic Tac Toe")
+    parser.add_argument("--profile", action="store_true", help="time moves, AI and painting (also STTT_PROFILE=1)")
+    parser.add_argument("--profile-moves", type=int, metavar="N", help="also run cProfile for the first N moves")
+    parser.add_argument("--profile-dir", help="where profile.prof and trace.json go (default: profiles)")
+    # Anything else is left for Qt
+    return parser.parse_known_args()
 
 def main():
-    app = QApplication(sys.argv)
+    args, qt_args = parse_args()
+    if args.profile or args.profile_moves or profiling.enabled_by_environment():
+        profiling.install(args.profile_dir, args.profile_moves)
+
+    app = QApplication(sys.argv[:1] + qt_args)
 
     # Load and apply stylesheet
     with open("src/styling/styles.qss", "r") as f:
         app.setStyleSheet(f.read())
 
     database.initialize_database()
+    app.aboutToQuit.connect(get_score_writer().shutdown)  # Before closing its connection
+    app.aboutToQuit.connect(database.close_connections)
 
     # database.clear_leaderboard()
 
@@ -0,0 +1,163 @@
+"""Headless AI-vs-AI tournaments.
+
+Plays games between two difficulties without creating any widgets, spread
+over worker processes. Every game gets its own seed, so a game can be
+replayed from its JSONL record. Example:
+
+    python src/selfplay.py Hard Expert --games 2000 --workers 8 --alternate --output results.jsonl
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import random
+import sys
+import time
+from game.core.engine import GameState, PLAYERS, X, O
+from game.ai import rules
+from game.ai.opening_book import get_default_book
+from game.ai.endgame import get_default_solver
+from game.ai.search import SearchEngine
+from game.ai.transposition import TranspositionTable
+from game.ai.mcts import MCTSEngine
+
+DIFFICULTIES = ("Easy", "Medium", "Hard", "Expert", "MCTS")
+
+
+def make_player(difficulty, rng, options):
+    """Return a function that picks a move index for the side to move"""
+    book = get_default_book()
+    endgame = get_default_solver()
+
+    if difficulty == "Easy":
+        return lambda state: rules.random_move(state, rng)
+    if difficulty == "Medium":
+        return lambda state: rules.medium_move(state, rng)
+    if difficulty == "Hard":
+        return lambda state: rules.hard_move(state, rng, book=book, endgame=endgame)
+
+    if difficulty == "Expert":
+        engine = SearchEngine(
+            time_limit=options.think_time, table=TranspositionTable(size_mb=16), endgame=endgame
+        )
+    else:
+        engine = MCTSEngine(
+            playouts=options.playouts, time_limit=options.mcts_time,
+            seed=rng.getrandbits(32), endgame=endgame
+        )
+
+    def search_player(state):
+        move = book.lookup(state)
+        return move if move is not None else engine.search(state)
+
+    return search_player
+
+
+def play_game(task):
+    index, seed, x_difficulty, o_difficulty, options = task
+    rng = random.Random(seed)
+    players = (make_player(x_difficulty, rng, options), make_player(o_difficulty, rng, options))
+    think_times = ([], [])
+    state = GameState()
+
+    while state.winner() is None:
+        side = state.side
+        start = time.perf_counter()
+        move = players[side](state)
+        think_times[side].append(round((time.perf_counter() - start) * 1000, 3))
+        state.make_move(move)
+
+    winner = state.winner()
+    difficulties = (x_difficulty, o_difficulty)
+    return {
+        "game": index,
+        "seed": seed,
+        "x": x_difficulty,
+        "o": o_difficulty,
+        "winner": winner,
+        "winner_difficulty": None if winner == "Draw" else difficulties[PLAYERS.index(winner)],
+        "plies": len(state.history),
+        "mini_boards_won": {"X": bin(state.macro[X]).count("1"), "O": bin(state.macro[O]).count("1")},
+        "think_ms": {"X": think_times[X], "O": think_times[O]},
+    }
+
+
+def wilson_interval(successes, total, z=1.96):
+    """95% Wilson score interval for a proportion"""
+    if total == 0:
+        return 0.0, 0.0
+    p = successes / total
+    denominator = 1 + z * z / total
+    centre = (p + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def print_summary(first, second, results, elapsed, out):
+    total = len(results)
+    if not total:
+        print("No games played", file=out)
+        return
+
+    if first == second:
+        # Same difficulty on both sides: report by colour instead
+        labels = [("X", lambda r: r["winner"] == "X"), ("O", lambda r: r["winner"] == "O")]
+    else:
+        labels = [
+            (first, lambda r: r["winner_difficulty"] == first),
+            (second, lambda r: r["winner_difficulty"] == second),
+        ]
+    labels.append(("Draw", lambda r: r["winner"] == "Draw"))
+
+    print(f"{total} games in {elapsed:.1f}s ({total / elapsed:.2f} games/s)", file=out)
+    for label, won in labels:
+        count = sum(1 for r in results if won(r))
+        low, high = wilson_interval(count, total)
+        print(f"  {label:<8} {count:>6}  {count / total:6.1%}  95% CI [{low:.1%}, {high:.1%}]", file=out)
+
+    plies = sum(r["plies"] for r in results) / total
+    print(f"  Mean game length: {plies:.1f} plies", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play AI-vs-AI games without the GUI")
+    parser.add_argument("first", choices=DIFFICULTIES, help="difficulty playing X (unless --alternate)")
+    parser.add_argument("second", choices=DIFFICULTIES, help="difficulty playing O (unless --alternate)")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--seed", type=int, default=0, help="game i uses seed + i")
+    parser.add_argument("--alternate", action="store_true", help="swap colours every other game")
+    parser.add_argument("--output", default="-", help="JSONL file for per-game results (- for stdout)")
+    parser.add_argument("--think-time", type=float, default=0.15, help="Expert seconds per move")
+    parser.add_argument("--mcts-time", type=float, default=1.0, help="MCTS seconds per move")
+    parser.add_argument("--playouts", type=int, default=None, help="MCTS playouts per move")
+    args = parser.parse_args()
+
+    tasks = []
+    for index in range(args.games):
+        x_difficulty, o_difficulty = args.first, args.second
+        if args.alternate and index % 2:
+            x_difficulty, o_difficulty = o_difficulty, x_difficulty
+        tasks.append((index, args.seed + index, x_difficulty, o_difficulty, args))
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    summary_out = sys.stderr if out is sys.stdout else sys.stdout
+    results = []
+    start = time.perf_counter()
+
+    try:
+        with multiprocessing.Pool(args.workers) as pool:
+            for result in pool.imap_unordered(play_game, tasks):
+                results.append(result)
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print_summary(args.first, args.second, results, time.perf_counter() - start, summary_out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Seeded regression test for the Hard AI.
+
+The games below were recorded with the Hard AI from before hard_move was
+rewritten to score moves in one pass. Replaying them with the same seeds must
+give the same moves, so any change to the priorities, the order moves are
+tried in or the way ``rng`` is drawn from shows up here.
+
+Run from ``src``: ``python -m unittest discover tests``
+"""
+
+import random
+import unittest
+from game.core.engine import GameState
+from game.ai import rules
+
+RANDOM_SHARE = 0.25  # Share of moves played at random, so games reach varied positions
+
+# seed -> (moves played, result)
+RECORDED_GAMES = {
+    0: ([49, 44, 76, 41, 48, 31, 36, 4, 38, 22, 37, 15, 55, 11, 21, 35, 77, 51, 54, 7, 63, 1, 13, 27, 50,
+         56, 24, 58, 60, 57, 25, 70, 68, 59], "O"),
+    1: ([8, 76, 43, 67, 36, 4, 44, 80, 72, 5, 49, 37, 13, 40, 42, 60, 59, 53, 78, 55, 17, 75, 34, 64, 15,
+         54, 3, 33, 56, 21, 32, 48, 35, 77, 50, 51, 62, 31, 70, 65, 23, 45, 7, 71, 6, 29, 24, 9, 11, 20,
+         25, 63, 26], "X"),
+    2: ([13, 41, 49, 39, 31, 40, 62, 80, 72, 6, 56, 25, 65, 19, 11, 22, 55, 15, 54, 5, 53, 77, 45, 7, 70,
+         71, 74, 12, 35, 73, 9, 8, 79, 66, 27, 64, 10, 76, 75, 78, 67, 69, 68, 63], "Draw"),
+    3: ([69, 61, 67, 43, 65, 25, 40, 42, 58, 44, 77, 45, 0, 1, 9, 5, 53, 75, 30, 33, 55, 10, 14, 51, 62,
+         78, 54, 3, 32, 48, 31, 4, 72, 19, 17, 80, 79, 22, 16, 11, 76, 73, 12, 13, 74, 15], "O"),
+    4: ([13, 43, 64, 14, 49, 41, 47, 22, 36, 4, 38, 23, 51, 58, 44, 76, 37, 12, 35, 78, 54, 6, 57, 33, 60,
+         2, 21, 29, 19, 15, 9, 31, 17, 74, 20, 24, 18], "X"),
+    5: ([43, 67, 39, 31, 40, 37, 13, 41, 48, 29, 22, 36, 7, 63, 4, 38, 20, 24, 57, 33, 55, 12, 1, 14, 52,
+         65, 25, 64, 10, 16, 19, 15, 60, 54, 72, 9], "O"),
+}
+
+
+def play_game(seed):
+    """Play one seeded game of Hard moves with some random ones mixed in"""
+    rng = random.Random(seed)
+    state = GameState()
+    moves = []
+    while state.winner() is None and state.legal_moves():
+        if rng.random() < RANDOM_SHARE:
+            move = rules.random_move(state, rng)
+        else:
+            move = rules.hard_move(state, rng)
+        state.make_move(move)
+        moves.append(move)
+    return moves, state.winner()
+
+
+class HardMoveParityTest(unittest.TestCase):
+    def test_recorded_games(self):
+        for seed, (expected_moves, expected_result) in RECORDED_GAMES.items():
+            with self.subTest(seed=seed):
+                moves, result = play_game(seed)
+                self.assertEqual(moves, expected_moves)
+                self.assertEqual(result, expected_result)
+
+
+if __name__ == "__main__":
+    unittest.main()